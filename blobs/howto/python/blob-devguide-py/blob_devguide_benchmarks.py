@@ -0,0 +1,530 @@
+# Benchmarks for the transfer samples in this folder. The samples run against a local stand-in for the
+# Blob service, so the results don't depend on an Azure account or on the network between here and a region.
+#
+# Run all benchmarks:          python blob_devguide_benchmarks.py
+# Run selected benchmarks:     python blob_devguide_benchmarks.py upload_blocks
+#
+# download_blob_chunks_to_sink downloads a blob twice the size of physical memory, so it only runs when it's named.
+#
+# The stand-in adds a fixed latency to each request and limits the throughput of each connection, which is
+# what makes concurrency pay off against the real service. Use --latency (seconds) and --bandwidth (MiB/s)
+# to model a different link.
+import asyncio
+import contextlib
+import email.utils
+import gc
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+from bisect import bisect_left, bisect_right
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from azure.storage.blob import BlobServiceClient
+from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+
+import blob_devguide_download
+import blob_devguide_list_blobs
+import blob_devguide_upload
+import blob_devguide_upload_async
+
+MiB = 1024*1024
+
+
+class LocalBlobRequestHandler(BaseHTTPRequestHandler):
+    # Keep connections open between requests, as the real service does
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def parse_request_path(self):
+        url = urlparse(self.path)
+        # The first path segment is the account name, the rest is the container and blob name
+        path = unquote(url.path).split("/", 2)[2] if url.path.count("/") >= 2 else ""
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        return path, query
+
+    def read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                body += self.rfile.read(size)
+                self.rfile.readline()
+            body = bytes(body)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.count("bytes_received", len(body))
+        return body
+
+    def throttle(self, size):
+        # Every request pays the latency, and larger bodies take longer on a bandwidth-limited connection
+        time.sleep(self.server.latency + size / self.server.bandwidth)
+
+    def send_headers(self, status, headers, content_length):
+        self.send_response(status)
+        self.send_header("Content-Length", str(content_length))
+        self.send_header("x-ms-request-id", str(self.server.count("requests", 1)))
+        self.send_header("x-ms-version", "2025-01-05")
+        self.send_header("Date", email.utils.formatdate(usegmt=True))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def send_empty(self, status, headers={}):
+        self.send_headers(status, headers, 0)
+
+    def send_error_code(self, status, error_code):
+        body = (f'<?xml version="1.0" encoding="utf-8"?><Error><Code>{error_code}</Code>'
+                f'<Message>{error_code}</Message></Error>').encode()
+        self.send_headers(status, {"Content-Type": "application/xml", "x-ms-error-code": error_code}, len(body))
+        self.wfile.write(body)
+
+    def blob_headers(self, path):
+        etag, last_modified = self.server.versions[path]
+        return {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "x-ms-blob-type": "BlockBlob",
+            "Accept-Ranges": "bytes",
+            "Content-Type": "application/octet-stream",
+        }
+
+    def do_PUT(self):
+        path, query = self.parse_request_path()
+        body = self.read_body()
+        self.throttle(len(body))
+        server = self.server
+
+        with server.lock:
+            if query.get("comp") == "block":
+                server.blocks.setdefault(path, {})[query["blockid"]] = body
+                etag = last_modified = None
+            elif query.get("comp") == "blocklist":
+                staged = server.blocks.pop(path, {})
+                block_ids = re.findall(r"<(?:Latest|Uncommitted)>([^<]*)</", body.decode())
+                server.store(path, b"".join(staged[block_id] for block_id in block_ids))
+            else:
+                server.store(path, body)
+            if query.get("comp") != "block":
+                etag, last_modified = server.versions[path]
+        self.send_empty(201, {"ETag": etag, "Last-Modified": last_modified} if etag else {})
+
+    def do_HEAD(self):
+        path, _ = self.parse_request_path()
+        self.throttle(0)
+        if path not in self.server.versions:
+            self.send_empty(404, {"x-ms-error-code": "BlobNotFound"})
+            return
+        self.send_headers(200, self.blob_headers(path), self.server.size(path))
+
+    def do_GET(self):
+        path, query = self.parse_request_path()
+        if path == "__stats":
+            self.send_stats(query)
+        elif query.get("comp") == "list":
+            self.send_listing(path, query)
+        else:
+            self.send_blob(path)
+
+    def send_stats(self, query):
+        with self.server.stats_lock:
+            body = json.dumps(self.server.stats).encode()
+            if "reset" in query:
+                self.server.stats = dict.fromkeys(self.server.stats, 0)
+        self.send_headers(200, {"Content-Type": "application/json"}, len(body))
+        self.wfile.write(body)
+
+    def send_blob(self, path):
+        if path not in self.server.versions:
+            self.throttle(0)
+            self.send_error_code(404, "BlobNotFound")
+            return
+
+        size = self.server.size(path)
+        headers = self.blob_headers(path)
+        status, start, end = 200, 0, size
+        range_header = self.headers.get("x-ms-range") or self.headers.get("Range")
+        if range_header:
+            first, _, last = range_header.split("=")[1].partition("-")
+            start, end = int(first), min(int(last) + 1 if last else size, size)
+            if start >= size:
+                self.throttle(0)
+                self.send_error_code(416, "InvalidRange")
+                return
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+
+        self.throttle(end - start)
+        self.send_headers(status, headers, end - start)
+        for piece in self.server.read(path, start, end):
+            self.wfile.write(piece)
+        self.server.count("bytes_sent", end - start)
+
+    def send_listing(self, path, query):
+        container = path.split("/")[0]
+        prefix = f"{container}/{query.get('prefix', '')}"
+        names = self.server.sorted_names()
+        start = bisect_left(names, f"{container}/{query['marker']}" if "marker" in query else prefix)
+        end = bisect_right(names, prefix + "\U0010ffff")
+        page = names[start:min(end, start + int(query.get("maxresults", 5000)))]
+        next_marker = names[start + len(page)][len(container) + 1:] if start + len(page) < end else ""
+
+        blobs = []
+        for name in page:
+            etag, last_modified = self.server.versions[name]
+            blobs.append(f"<Blob><Name>{name[len(container) + 1:]}</Name><Properties>"
+                         f"<Last-Modified>{last_modified}</Last-Modified><Etag>{etag}</Etag>"
+                         f"<Content-Length>{self.server.size(name)}</Content-Length>"
+                         f"<Content-Type>application/octet-stream</Content-Type><BlobType>BlockBlob</BlobType>"
+                         f"<AccessTier>Hot</AccessTier><AccessTierInferred>true</AccessTierInferred>"
+                         f"<LeaseStatus>unlocked</LeaseStatus><LeaseState>available</LeaseState>"
+                         f"</Properties></Blob>")
+        body = (f'<?xml version="1.0" encoding="utf-8"?><EnumerationResults ContainerName="{container}">'
+                f"<Prefix>{query.get('prefix', '')}</Prefix><Blobs>{''.join(blobs)}</Blobs>"
+                f"<NextMarker>{next_marker}</NextMarker></EnumerationResults>").encode()
+        self.throttle(len(body))
+        self.send_headers(200, {"Content-Type": "application/xml"}, len(body))
+        self.wfile.write(body)
+
+
+class LocalBlobServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency, bandwidth, virtual_blobs):
+        super().__init__(("127.0.0.1", 0), LocalBlobRequestHandler)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "bytes_received": 0, "bytes_sent": 0}
+        self.blobs = {}
+        self.blocks = {}
+        self.versions = {}
+        self.names = None
+        # Virtual blobs have a size but no stored content, so blobs larger than memory can be served
+        self.virtual_blobs = dict(virtual_blobs)
+        self.pattern = hashlib.shake_256(b"blob-devguide").digest(MiB)
+        for path in self.virtual_blobs:
+            self.versions[path] = self.new_version()
+
+    def new_version(self):
+        return f'"0x{time.time_ns():X}"', email.utils.formatdate(usegmt=True)
+
+    def count(self, name, value):
+        with self.stats_lock:
+            self.stats[name] += value
+            return self.stats[name]
+
+    def store(self, path, data):
+        # Called with the lock held
+        if path not in self.versions:
+            self.names = None
+        self.blobs[path] = data
+        self.virtual_blobs.pop(path, None)
+        self.versions[path] = self.new_version()
+
+    def size(self, path):
+        if path in self.virtual_blobs:
+            return self.virtual_blobs[path]
+        return len(self.blobs[path])
+
+    def read(self, path, start, end):
+        if path not in self.virtual_blobs:
+            yield self.blobs[path][start:end]
+            return
+        # Virtual content repeats a fixed 1 MiB pattern, written a piece at a time
+        while start < end:
+            offset = start % MiB
+            piece = self.pattern[offset:min(MiB, offset + end - start)]
+            yield piece
+            start += len(piece)
+
+    def sorted_names(self):
+        with self.lock:
+            if self.names is None:
+                self.names = sorted(self.versions)
+            return self.names
+
+
+def serve(connection, latency, bandwidth, virtual_blobs):
+    server = LocalBlobServer(latency, bandwidth, virtual_blobs)
+    connection.send(server.server_address[1])
+    server.serve_forever()
+
+
+class LocalBlobService(object):
+    """Runs the stand-in service in a child process, so its CPU time and memory aren't counted against the client."""
+
+    def __init__(self, latency=0.02, bandwidth=64*MiB, virtual_blobs=None):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.virtual_blobs = virtual_blobs or {}
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        parent_connection, child_connection = context.Pipe()
+        self.process = context.Process(target=serve, daemon=True,
+                                       args=(child_connection, self.latency, self.bandwidth, self.virtual_blobs))
+        self.process.start()
+        port = parent_connection.recv()
+        self.account_url = f"http://127.0.0.1:{port}/devstoreaccount1"
+        return self
+
+    def __exit__(self, *exc_info):
+        self.process.terminate()
+        self.process.join()
+
+    def get_blob_service_client(self, **kwargs):
+        return BlobServiceClient(self.account_url, credential=None, **kwargs)
+
+    def get_async_blob_service_client(self):
+        return AsyncBlobServiceClient(self.account_url, credential=None)
+
+    def stats(self, reset=False):
+        with urllib.request.urlopen(f"{self.account_url}/__stats{'?reset=1' if reset else ''}") as response:
+            return json.load(response)
+
+
+def create_local_file(directory, size, name="benchmark.bin"):
+    path = os.path.join(directory, name)
+    with open(file=path, mode="wb") as file:
+        for offset in range(0, size, MiB):
+            file.write(os.urandom(min(MiB, size - offset)))
+    return path
+
+
+def measure(function, *args, trace_memory=False, **kwargs):
+    """Calls function and returns its result with the wall time, process CPU time, and traced memory, both at its peak
+    and still allocated when function returns."""
+    if trace_memory:
+        tracemalloc.start()
+    start, start_cpu = time.perf_counter(), time.process_time()
+    try:
+        result = function(*args, **kwargs)
+    finally:
+        seconds, cpu_seconds = time.perf_counter() - start, time.process_time() - start_cpu
+        current_bytes, peak_bytes = 0, 0
+        if trace_memory:
+            # Reference cycles left by the call are collected first, so only what the result holds is counted
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            gc.collect()
+            current_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+    return result, {"seconds": seconds, "cpu_seconds": cpu_seconds, "peak_bytes": peak_bytes, "current_bytes": current_bytes}
+
+
+async def measure_async(coroutine_function, *args, **kwargs):
+    """Awaits coroutine_function and returns its result with the wall time and process CPU time."""
+    start, start_cpu = time.perf_counter(), time.process_time()
+    result = await coroutine_function(*args, **kwargs)
+    return result, {"seconds": time.perf_counter() - start, "cpu_seconds": time.process_time() - start_cpu, "peak_bytes": 0,
+                    "current_bytes": 0}
+
+
+def report(name, size, measurement):
+    print(f"  {name:<40} {size / MiB / measurement['seconds']:8.1f} MiB/s {measurement['seconds']:7.2f} s"
+          f"{measurement['cpu_seconds']:7.2f} s CPU"
+          + (f"{measurement['peak_bytes'] / MiB:9.1f} MiB peak" if measurement['peak_bytes'] else ""))
+
+
+class BlobBenchmarks(object):
+    # Benchmarks that are only run when they're named, because of how long they take or how much they transfer
+    run_when_named = {"download_blob_chunks_to_sink"}
+
+    def __init__(self, latency=0.02, bandwidth=64*MiB):
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def benchmark_upload_blocks(self, file_size=128*MiB, block_size=4*MiB):
+        print(f"upload_blocks: {file_size // MiB} MiB file, {block_size // MiB} MiB blocks")
+        sample = blob_devguide_upload.BlobSamples()
+
+        with tempfile.TemporaryDirectory() as directory, LocalBlobService(self.latency, self.bandwidth) as service:
+            local_file_path = create_local_file(directory, file_size)
+            container_client = service.get_blob_service_client().get_container_client("sample-container")
+            blob_client = container_client.get_blob_client(os.path.basename(local_file_path))
+
+            _, measurement = measure(sample.upload_blocks, container_client, local_file_path, block_size)
+            report("sequential", file_size, measurement)
+            for max_concurrency in (4, 8, 16):
+                _, measurement = measure(sample.upload_blocks_concurrent, container_client, local_file_path, block_size,
+                                         max_concurrency=max_concurrency)
+                report(f"concurrent, max_concurrency={max_concurrency}", file_size, measurement)
+            assert blob_client.get_blob_properties().size == file_size
+
+    def benchmark_upload_blocks_mmap(self, file_size=128*MiB, block_size=8*MiB):
+        print(f"upload_blocks_mmap: {file_size // MiB} MiB file, {block_size // MiB} MiB blocks")
+        sample = blob_devguide_upload.BlobSamples()
+
+        with tempfile.TemporaryDirectory() as directory, LocalBlobService(self.latency, self.bandwidth) as service:
+            local_file_path = create_local_file(directory, file_size)
+            container_client = service.get_blob_service_client().get_container_client("sample-container")
+            blob_client = container_client.get_blob_client(os.path.basename(local_file_path))
+
+            # Peak traced memory counts the Python objects each approach allocates, mapped file pages aren't included
+            for name, upload in (("read into bytes", sample.upload_blocks), ("memory-mapped", sample.upload_blocks_mmap)):
+                _, measurement = measure(upload, container_client, local_file_path, block_size, trace_memory=True)
+                report(name, file_size, measurement)
+                assert blob_client.get_blob_properties().size == file_size
+
+    def benchmark_upload_blocks_async(self, file_size=128*MiB, block_size=4*MiB):
+        print(f"upload_blocks_async: {file_size // MiB} MiB file, {block_size // MiB} MiB blocks")
+        sample = blob_devguide_upload_async.BlobSamples()
+
+        async def run(service, local_file_path):
+            async with service.get_async_blob_service_client() as blob_service_client:
+                container_client = blob_service_client.get_container_client("sample-container")
+                blob_client = container_client.get_blob_client(os.path.basename(local_file_path))
+
+                _, measurement = await measure_async(sample.upload_blocks, container_client, local_file_path, block_size)
+                report("sequential coroutine", file_size, measurement)
+                for max_concurrency in (4, 8, 16):
+                    _, measurement = await measure_async(sample.upload_blocks_concurrent, container_client, local_file_path,
+                                                         block_size, max_concurrency=max_concurrency)
+                    report(f"pipeline, max_concurrency={max_concurrency}", file_size, measurement)
+                assert (await blob_client.get_blob_properties()).size == file_size
+
+        with tempfile.TemporaryDirectory() as directory, LocalBlobService(self.latency, self.bandwidth) as service:
+            asyncio.run(run(service, create_local_file(directory, file_size)))
+
+    def benchmark_upload_blob_transfer_options_autotune(self, file_size=256*MiB):
+        print(f"upload_blob_transfer_options_autotune: {file_size // MiB} MiB file")
+        sample = blob_devguide_upload.BlobSamples()
+
+        with tempfile.TemporaryDirectory() as directory, LocalBlobService(self.latency, self.bandwidth) as service:
+            local_file_path = create_local_file(directory, file_size)
+            profile_path = os.path.join(directory, "profiles.json")
+
+            # The fixed settings are the ones used by upload_blob_transfer_options
+            blob_service_client = service.get_blob_service_client(max_block_size=4*MiB, max_single_put_size=8*MiB)
+            blob_client = blob_service_client.get_blob_client("sample-container", os.path.basename(local_file_path))
+            with open(file=local_file_path, mode="rb") as data:
+                _, measurement = measure(blob_client.upload_blob, data, overwrite=True, max_concurrency=2)
+            report("fixed, 4 MiB blocks, max_concurrency=2", file_size, measurement)
+
+            # The first run tunes from the default settings, the second starts from the saved profile
+            blob_service_client = service.get_blob_service_client()
+            for name in ("autotune, first run", "autotune, saved profile"):
+                _, measurement = measure(sample.upload_blob_transfer_options_autotune, blob_service_client, "sample-container",
+                                         local_file_path, profile_path=profile_path)
+                with open(file=profile_path, mode="r") as profile_file:
+                    profile = next(iter(json.load(profile_file).values()))
+                report(name, file_size, measurement)
+                print(f"    saved profile: {profile['block_size'] // MiB} MiB blocks, max_concurrency={profile['max_concurrency']}")
+                assert blob_client.get_blob_properties().size == file_size
+
+    def benchmark_upload_blob_stream_compressed(self, data_size=256*MiB):
+        print(f"upload_blob_stream_compressed: {data_size // MiB} MiB of CSV")
+        sample = blob_devguide_upload.BlobSamples()
+
+        # Rows with repeating fields and increasing numbers compress about as well as typical CSV exports
+        rows = (f"{index},sensor-{index % 64},2024-01-01T00:{index % 60:02d}:00Z,{index * 0.25:.2f},ok\n" for index in range(10**9))
+        data = bytearray()
+        while len(data) < data_size:
+            data += "".join(next(rows) for _ in range(10000)).encode()
+        del data[data_size:]
+
+        with LocalBlobService(self.latency, self.bandwidth) as service:
+            blob_service_client = service.get_blob_service_client()
+            blob_client = blob_service_client.get_blob_client("sample-container", "sample-blob.csv")
+
+            # Both sides stage the same number of blocks at a time, so only compression differs between them
+            max_concurrency = 2
+            service.stats(reset=True)
+            _, measurement = measure(blob_client.upload_blob, io.BytesIO(data), overwrite=True, max_concurrency=max_concurrency)
+            report("uncompressed", data_size, measurement)
+            print(f"    bytes on wire: {service.stats(reset=True)['bytes_received'] / MiB:.1f} MiB")
+
+            for name, compress_in_thread in (("compressed inline", False), ("compressed in a worker thread", True)):
+                _, measurement = measure(sample.upload_blob_stream_compressed, blob_service_client, "sample-container",
+                                         "sample-blob.csv", io.BytesIO(data), compress_in_thread=compress_in_thread,
+                                         max_concurrency=max_concurrency)
+                report(name, data_size, measurement)
+                print(f"    bytes on wire: {service.stats(reset=True)['bytes_received'] / MiB:.1f} MiB")
+
+    def benchmark_download_blob_chunks_to_sink(self, blob_size=None, chunk_size=4*MiB, pool_size=2):
+        # By default the blob is twice the size of physical memory, so it can only be downloaded if memory stays bounded
+        if blob_size is None:
+            blob_size = 2 * os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") if hasattr(os, "sysconf") else 16*1024*MiB
+        print(f"download_blob_chunks_to_sink: {blob_size / 1024 / MiB:.1f} GiB blob, {chunk_size // MiB} MiB chunks, pool of {pool_size}")
+        sample = blob_devguide_download.BlobSamples()
+
+        # The pooled buffers, plus what the SDK allocates for each range being downloaded: it builds a list sized by the
+        # length of the response, about 8 bytes per byte of the range, before joining it into bytes. Up to pool_size - 1
+        # ranges are downloaded at once. None of this grows with the blob
+        ceiling = pool_size * chunk_size + max(1, pool_size - 1) * 10 * chunk_size + 16*MiB
+        received = 0
+
+        def sink(view):
+            nonlocal received
+            received += len(view)
+
+        # This is a memory test, so the stand-in doesn't add latency or limit bandwidth
+        virtual_blobs = {"sample-container/sample-large-blob.bin": blob_size}
+        with LocalBlobService(latency=0, bandwidth=float("inf"), virtual_blobs=virtual_blobs) as service:
+            _, measurement = measure(sample.download_blob_chunks_to_sink, service.get_blob_service_client(), "sample-container",
+                                     "sample-large-blob.bin", sink, chunk_size=chunk_size, pool_size=pool_size, trace_memory=True)
+        report("pooled buffers", blob_size, measurement)
+
+        assert received == blob_size
+        if measurement["peak_bytes"] > ceiling:
+            raise RuntimeError(f"Peak memory of {measurement['peak_bytes'] / MiB:.1f} MiB is over the "
+                               f"{ceiling / MiB:.1f} MiB ceiling")
+        print(f"    peak memory is within the {ceiling / MiB:.1f} MiB ceiling")
+
+
+    def benchmark_list_blobs_flat_compact(self, blob_count=20000):
+        print(f"list_blobs_flat_compact: {blob_count} blobs")
+        sample = blob_devguide_list_blobs.BlobSamples()
+
+        def report_memory(name, measurement):
+            # The peak includes the page being parsed, so the memory still held afterwards is what grows with the listing
+            print(f"  {name:<40} {measurement['current_bytes'] / blob_count:8.0f} bytes/blob"
+                  f"{measurement['current_bytes'] / MiB:9.1f} MiB held{measurement['peak_bytes'] / MiB:9.1f} MiB peak")
+
+        # Only memory is compared here, so listing pages are served as fast as the stand-in can build them
+        virtual_blobs = {f"sample-container/logs/2024/01/01/sample-blob-{index:08d}.json": 4096 for index in range(blob_count)}
+        with LocalBlobService(latency=0, bandwidth=float("inf"), virtual_blobs=virtual_blobs) as service:
+            blob_service_client = service.get_blob_service_client()
+            container_client = blob_service_client.get_container_client("sample-container")
+
+            blob_list, measurement = measure(lambda: list(container_client.list_blobs()), trace_memory=True)
+            assert len(blob_list) == blob_count
+            del blob_list
+            report_memory("list of BlobProperties", measurement)
+
+            # The sample prints every blob, which isn't part of what's measured
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                blob_list, measurement = measure(sample.list_blobs_flat_compact, blob_service_client, "sample-container",
+                                                 trace_memory=True)
+            assert len(blob_list) == blob_count
+            report_memory("CompactBlobList", measurement)
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+    options = {"latency": 0.02, "bandwidth": 64}
+    for option in list(options):
+        if f"--{option}" in arguments:
+            index = arguments.index(f"--{option}")
+            options[option] = float(arguments[index + 1])
+            del arguments[index:index + 2]
+
+    benchmarks = BlobBenchmarks(latency=options["latency"], bandwidth=options["bandwidth"] * MiB)
+    names = arguments or [name[len("benchmark_"):] for name in dir(benchmarks)
+                          if name.startswith("benchmark_") and name[len("benchmark_"):] not in benchmarks.run_when_named]
+    for name in names:
+        getattr(benchmarks, f"benchmark_{name}")()
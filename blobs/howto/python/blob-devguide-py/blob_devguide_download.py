@@ -1,10 +1,158 @@
 # <Snippet_imports>
+import codecs
+import glob
+import hashlib
 import io
+import json
 import os
+import sqlite3
+import struct
+import tempfile
+import uuid
+import zipfile
+import zlib
+from collections import OrderedDict, deque
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceModifiedError, ResourceNotFoundError
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient, BlobClient
 # </Snippet_imports>
 
+# <Snippet_blob_range_reader>
+class BlobRangeReader(io.RawIOBase):
+    # A read-only, seekable file object that reads a blob with ranged downloads
+    def __init__(self, blob_client: BlobClient, block_size: int = 1024*64, cache_blocks: int = 64, max_readahead_blocks: int = 16):
+        super().__init__()
+        properties = blob_client.get_blob_properties()
+        self._blob_client = blob_client
+        self._size = properties.size
+        self._etag = properties.etag
+        self._block_size = block_size
+        self._cache_blocks = cache_blocks
+        self._max_readahead_blocks = max_readahead_blocks
+        self._readahead_blocks = 1
+        self._position = 0
+        self._last_read_end = None
+
+        # Cached blocks keyed by block index, in least recently used order
+        self._cache = OrderedDict()
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast("B")
+        end = min(self._position + len(view), self._size)
+        if self._position >= end:
+            return 0
+
+        # A read that continues where the last one ended is sequential, any other read resets the read ahead
+        sequential = self._position == self._last_read_end
+        if not sequential:
+            self._readahead_blocks = 1
+
+        # Blocks are only fetched when one of them is missing, and then the read ahead blocks are fetched with them
+        # Read ahead only grows when sequential reads keep running past the cached blocks, so a few small reads
+        # that are served from the cache, like a header and then a name, don't make the next fetch any larger
+        first_block = self._position // self._block_size
+        last_block = (end - 1) // self._block_size
+        if any(block_index not in self._cache for block_index in range(first_block, last_block + 1)):
+            self._fetch_blocks(first_block, last_block + self._readahead_blocks - 1)
+            if sequential:
+                self._readahead_blocks = min(self._readahead_blocks * 2, self._max_readahead_blocks, self._cache_blocks)
+
+        count = 0
+        for block_index in range(first_block, last_block + 1):
+            self._cache.move_to_end(block_index)
+            block_start = block_index * self._block_size
+            start = max(self._position, block_start) - block_start
+            stop = min(end, block_start + self._block_size) - block_start
+            view[count:count + stop - start] = self._cache[block_index][start:stop]
+            count += stop - start
+
+        # Read ahead blocks are kept after the blocks just read in the eviction order, so they stay cached until they're read
+        for block_index in range(last_block + 1, last_block + self._readahead_blocks):
+            if block_index in self._cache:
+                self._cache.move_to_end(block_index)
+
+        # Evict the least recently used blocks once the cache is full
+        while len(self._cache) > max(self._cache_blocks, last_block - first_block + self._readahead_blocks):
+            self._cache.popitem(last=False)
+
+        self._position = end
+        self._last_read_end = end
+        return count
+
+    def _fetch_blocks(self, first_block: int, last_block: int):
+        last_block = min(last_block, (self._size - 1) // self._block_size)
+
+        # Missing blocks next to each other are coalesced into a single ranged download
+        block_index = first_block
+        while block_index <= last_block:
+            if block_index in self._cache:
+                block_index += 1
+                continue
+
+            run_end = block_index
+            while run_end < last_block and run_end + 1 not in self._cache:
+                run_end += 1
+
+            # Pin every read to the ETag, so all reads come from the same version of the blob
+            offset = block_index * self._block_size
+            length = min((run_end + 1) * self._block_size, self._size) - offset
+            data = self._blob_client.download_blob(offset=offset, length=length, etag=self._etag,
+                                                   match_condition=MatchConditions.IfNotModified).readall()
+
+            for index in range(block_index, run_end + 1):
+                block_offset = (index - block_index) * self._block_size
+                self._cache[index] = data[block_offset:block_offset + self._block_size]
+            block_index = run_end + 1
+# </Snippet_blob_range_reader>
+
+# <Snippet_memoryview_writer>
+class MemoryviewWriter(io.RawIOBase):
+    # A write-only file object over an existing buffer, so download_blob().readinto() can fill the buffer in place
+    def __init__(self, buffer):
+        super().__init__()
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def tell(self):
+        return self._position
+
+    def write(self, data):
+        # Writing past the end of the buffer raises ValueError, rather than growing the buffer
+        count = len(data)
+        self._view[self._position:self._position + count] = data
+        self._position += count
+        return count
+# </Snippet_memoryview_writer>
+
 class BlobSamples(object):
 
     # <Snippet_download_blob_file>
@@ -15,6 +163,171 @@ class BlobSamples(object):
             sample_blob.write(download_stream.readall())
     # </Snippet_download_blob_file>
 
+    # <Snippet_download_blob_file_ranges>
+    def download_blob_to_file_ranges(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str, local_file_path: str,
+                                     chunk_size: int = 1024*1024*4, max_concurrency: int = 8):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        properties = blob_client.get_blob_properties()
+
+        def download_range(offset: int):
+            # Pin each range to the ETag so that every range comes from the same version of the blob
+            length = min(chunk_size, properties.size - offset)
+            data = blob_client.download_blob(offset=offset, length=length, etag=properties.etag,
+                                             match_condition=MatchConditions.IfNotModified).readall()
+
+            # Each range is written at its own offset, so ranges can complete in any order
+            # os.pwrite can write fewer bytes than it's given, so keep writing until the whole range is on disk
+            with memoryview(data) as view:
+                written = 0
+                while written < len(view):
+                    written += os.pwrite(fd, view[written:], offset + written)
+
+        fd = os.open(local_file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # Preallocate the file to the size of the blob (os.pwrite and os.posix_fallocate are available on Unix)
+            if hasattr(os, "posix_fallocate") and properties.size > 0:
+                os.posix_fallocate(fd, 0, properties.size)
+            else:
+                os.ftruncate(fd, properties.size)
+
+            # Only max_concurrency ranges are held in memory at any time
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                list(executor.map(download_range, range(0, properties.size, chunk_size)))
+        finally:
+            os.close(fd)
+    # </Snippet_download_blob_file_ranges>
+
+    # <Snippet_download_blob_mirror>
+    def mirror_container_to_directory(self, blob_service_client: BlobServiceClient, container_name: str, local_dir_path: str,
+                                      delete_orphans: bool = False, max_concurrency: int = 16, manifest_path: str = None,
+                                      commit_interval: int = 1000):
+        container_client = blob_service_client.get_container_client(container=container_name)
+        os.makedirs(local_dir_path, exist_ok=True)
+        root = os.path.realpath(local_dir_path)
+
+        # The manifest and the partially downloaded files are kept next to the mirror rather than inside it,
+        # so no blob name can collide with them
+        manifest_path = manifest_path or root + ".mirror-manifest.db"
+        staging_dir_path = root + ".mirror-partial"
+        os.makedirs(staging_dir_path, exist_ok=True)
+
+        # Every blob seen in this sync is stamped with the sync ID, so the blobs that weren't seen can be found afterwards
+        sync_id = uuid.uuid4().hex
+        downloaded = unchanged = skipped = deleted = 0
+
+        def get_local_path(blob_name: str):
+            # Blob names can contain "..", empty, or drive-qualified segments, any of which could point outside
+            # local_dir_path, so those names aren't mapped to a path at all
+            segments = blob_name.split("/")
+            for segment in segments:
+                if segment in ("", ".", "..") or os.sep in segment or (os.altsep and os.altsep in segment) \
+                        or os.path.splitdrive(segment)[0]:
+                    return None
+            local_path = os.path.join(root, *segments)
+
+            # A symbolic link inside local_dir_path could still point outside it
+            if os.path.commonpath([root, os.path.realpath(local_path)]) != root:
+                return None
+            return local_path
+
+        def download_blob(blob, local_path: str):
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+
+            # Download to a temporary file, so an interrupted download never replaces a good local copy
+            fd, partial_path = tempfile.mkstemp(dir=staging_dir_path, suffix=".partial")
+            try:
+                with open(fd, mode="wb") as sample_blob:
+                    container_client.download_blob(blob.name, etag=blob.etag, match_condition=MatchConditions.IfNotModified).readinto(sample_blob)
+                os.replace(partial_path, local_path)
+            except (ResourceModifiedError, ResourceNotFoundError) as error:
+                # The blob changed or was deleted after it was listed, which is left for the next sync to pick up
+                os.remove(partial_path)
+                return blob, error
+            except BaseException:
+                os.remove(partial_path)
+                raise
+            return blob, None
+
+        with closing(sqlite3.connect(manifest_path)) as manifest, ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            manifest.execute("CREATE TABLE IF NOT EXISTS blobs (name TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, size INTEGER, sync_id TEXT)")
+            in_flight = set()
+            uncommitted = 0
+
+            def record_change():
+                # Progress is committed as the sync goes, so a sync that fails part way only repeats the uncommitted work
+                nonlocal uncommitted
+                uncommitted += 1
+                if uncommitted >= commit_interval:
+                    manifest.commit()
+                    uncommitted = 0
+
+            def record_downloads(done):
+                nonlocal downloaded, skipped
+                for future in done:
+                    blob, error = future.result()
+                    if isinstance(error, ResourceModifiedError):
+                        # The blob still exists, so its old manifest entry is kept out of the orphans, and its ETag
+                        # no longer matches, so the next sync downloads it again
+                        print(f"Skipping {blob.name!r}, it changed after it was listed")
+                        manifest.execute("UPDATE blobs SET sync_id = ? WHERE name = ?", (sync_id, blob.name))
+                        skipped += 1
+                    elif error:
+                        print(f"Skipping {blob.name!r}, it was deleted after it was listed")
+                        skipped += 1
+                    else:
+                        manifest.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?)",
+                                         (blob.name, blob.etag, blob.last_modified.isoformat(), blob.size, sync_id))
+                        downloaded += 1
+                    record_change()
+
+            for blob in container_client.list_blobs():
+                # Skip zero-length directory marker blobs
+                if blob.name.endswith("/"):
+                    continue
+                local_path = get_local_path(blob.name)
+                if local_path is None:
+                    print(f"Skipping {blob.name!r}, the name isn't a safe local path")
+                    continue
+
+                # A blob is unchanged if its ETag, last modified time, and size all match the manifest, and the local copy still exists
+                row = manifest.execute("SELECT etag, last_modified, size FROM blobs WHERE name = ?", (blob.name,)).fetchone()
+                if row == (blob.etag, blob.last_modified.isoformat(), blob.size) and os.path.exists(local_path):
+                    manifest.execute("UPDATE blobs SET sync_id = ? WHERE name = ?", (sync_id, blob.name))
+                    unchanged += 1
+                    record_change()
+                    continue
+
+                in_flight.add(executor.submit(download_blob, blob, local_path))
+                if len(in_flight) >= max_concurrency * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    record_downloads(done)
+
+            record_downloads(wait(in_flight).done)
+
+            # Blobs in the manifest that weren't seen in this sync have been deleted from the container
+            if delete_orphans:
+                for (blob_name,) in manifest.execute("SELECT name FROM blobs WHERE sync_id != ?", (sync_id,)).fetchall():
+                    local_path = get_local_path(blob_name)
+                    if local_path is None:
+                        continue
+                    try:
+                        os.remove(local_path)
+                    except FileNotFoundError:
+                        pass
+                    deleted += 1
+                manifest.execute("DELETE FROM blobs WHERE sync_id != ?", (sync_id,))
+
+            manifest.commit()
+
+        # Every partial file from this sync has been moved into place or removed, so the staging directory can go
+        # unless another sync of the same directory is using it
+        try:
+            os.rmdir(staging_dir_path)
+        except OSError:
+            pass
+        print(f"Downloaded: {downloaded}, unchanged: {unchanged}, skipped: {skipped}, deleted: {deleted}")
+    # </Snippet_download_blob_mirror>
+
     # <Snippet_download_blob_chunks>
     def download_blob_chunks(self, blob_service_client: BlobServiceClient, container_name):
         blob_client = blob_service_client.get_blob_client(container=container_name, blob="sample-blob.txt")
@@ -29,6 +342,87 @@ class BlobSamples(object):
             chunk_list.append(chunk)
     # </Snippet_download_blob_chunks>
 
+    # <Snippet_download_blob_chunks_sink>
+    def download_blob_chunks_to_sink(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str, sink,
+                                     chunk_size: int = 1024*1024*4, pool_size: int = 2):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        properties = blob_client.get_blob_properties()
+        offsets = iter(range(0, properties.size, chunk_size))
+        next_index = 0
+
+        # A fixed pool of buffers is reused for the whole download: the sink reads from one of them while the next
+        # ranges are downloaded into the others, so up to pool_size - 1 downloads run ahead of the sink
+        buffer_pool = [bytearray(chunk_size) for _ in range(pool_size)]
+
+        def download_range(buffer: bytearray, offset: int):
+            # Each range is downloaded straight into a pooled buffer, pinned to the ETag so that every range comes
+            # from the same version of the blob
+            length = min(chunk_size, properties.size - offset)
+            stream = blob_client.download_blob(offset=offset, length=length, etag=properties.etag,
+                                               match_condition=MatchConditions.IfNotModified)
+            stream.readinto(MemoryviewWriter(buffer))
+            return buffer, length
+
+        def submit_next():
+            nonlocal next_index
+            offset = next(offsets, None)
+            if offset is None:
+                return False
+            pending.append(executor.submit(download_range, buffer_pool[next_index % pool_size], offset))
+            next_index += 1
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, pool_size - 1)) as executor:
+            pending = deque()
+            while pending or submit_next():
+                buffer, length = pending.popleft().result()
+
+                # A buffer is only downloaded into again after the sink has returned from the view of it it was given,
+                # so the view passed to the sink is only valid until the sink returns
+                while len(pending) < pool_size - 1 and submit_next():
+                    pass
+                sink(memoryview(buffer)[:length])
+    # </Snippet_download_blob_chunks_sink>
+
+    # <Snippet_download_blob_chunks_prefetch>
+    def download_blob_chunks_prefetch(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str,
+                                      chunk_size: int = 1024*1024*4, max_prefetch: int = 8):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        properties = blob_client.get_blob_properties()
+        offsets = iter(range(0, properties.size, chunk_size))
+        prefetch = 1
+
+        def download_chunk(offset: int):
+            length = min(chunk_size, properties.size - offset)
+            return blob_client.download_blob(offset=offset, length=length, etag=properties.etag,
+                                             match_condition=MatchConditions.IfNotModified).readall()
+
+        def fill(pending: deque):
+            while len(pending) < prefetch:
+                offset = next(offsets, None)
+                if offset is None:
+                    break
+                pending.append(executor.submit(download_chunk, offset))
+
+        with ThreadPoolExecutor(max_workers=max_prefetch) as executor:
+            pending = deque()
+            fill(pending)
+
+            while pending:
+                future = pending.popleft()
+
+                # If the next chunk isn't ready yet, the network is the bottleneck, so prefetch further ahead
+                # If it's already there, the consumer is the bottleneck, so fewer chunks need to be in flight
+                if future.done():
+                    prefetch = max(1, prefetch - 1)
+                else:
+                    prefetch = min(prefetch + 1, max_prefetch)
+
+                # Start the next downloads before handing over this chunk, so they run while the chunk is processed
+                fill(pending)
+                yield future.result()
+    # </Snippet_download_blob_chunks_prefetch>
+
     # <Snippet_download_blob_stream>
     def download_blob_to_stream(self, blob_service_client: BlobServiceClient, container_name):
         blob_client = blob_service_client.get_blob_client(container=container_name, blob="sample-blob.txt")
@@ -39,6 +433,16 @@ class BlobSamples(object):
         print(f"Number of bytes: {num_bytes}")
     # </Snippet_download_blob_stream>
 
+    # <Snippet_download_blob_random_access>
+    def download_blob_random_access(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+        # zipfile seeks to the central directory at the end of the archive, so only the ranges it reads are downloaded
+        with BlobRangeReader(blob_client) as reader, zipfile.ZipFile(reader) as archive:
+            for name in archive.namelist():
+                print(f"Archive member: {name}")
+    # </Snippet_download_blob_random_access>
+
     # <Snippet_download_blob_text>
     def download_blob_to_string(self, blob_service_client: BlobServiceClient, container_name):
         blob_client = blob_service_client.get_blob_client(container=container_name, blob="sample-blob.txt")
@@ -49,6 +453,134 @@ class BlobSamples(object):
         print(f"Blob contents: {blob_text}")
     # </Snippet_download_blob_text>
 
+    # <Snippet_download_blob_text_lines>
+    def download_blob_text_lines(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str,
+                                 delimiter: str = "\n", decompress: bool = False, encoding: str = "UTF-8"):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+        # The incremental decoder holds back the bytes of a multi-byte character that's split across two chunks
+        decoder = codecs.getincrementaldecoder(encoding)()
+        decompressor = zlib.decompressobj(wbits=31) if decompress else None # 31 selects the gzip container format
+        remainder = ""
+
+        stream = blob_client.download_blob()
+        for chunk in stream.chunks():
+            if decompressor:
+                # A gzip file can hold several members back to back, and a decompressor stops at the end of the first one,
+                # so a new decompressor is started on the data that follows each member
+                data = b""
+                while chunk:
+                    if decompressor.eof:
+                        decompressor = zlib.decompressobj(wbits=31)
+                    data += decompressor.decompress(chunk)
+                    chunk = decompressor.unused_data
+                chunk = data
+
+            # Only the last, possibly incomplete record is carried over to the next chunk
+            records = (remainder + decoder.decode(chunk)).split(delimiter)
+            remainder = records.pop()
+            yield from records
+
+        if decompressor and stream.size and not decompressor.eof:
+            raise ValueError(f"{blob_name} ends part way through a gzip member")
+        final_bytes = decompressor.flush() if decompressor else b""
+        records = (remainder + decoder.decode(final_bytes, final=True)).split(delimiter)
+        remainder = records.pop()
+        yield from records
+        if remainder:
+            yield remainder
+    # </Snippet_download_blob_text_lines>
+
+    # <Snippet_download_blob_cached>
+    def download_blob_cached(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str,
+                             cache_dir: str = "blob_cache", max_cache_bytes: int = 1024*1024*1024):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Each cache entry is named after the account, container, and blob, followed by the hex-encoded ETag of its content
+        cache_key = hashlib.sha256(f"{blob_client.account_name}/{container_name}/{blob_name}".encode()).hexdigest()
+        cached_entries = glob.glob(os.path.join(cache_dir, cache_key + ".*"))
+        downloader = None
+
+        if cached_entries:
+            entry_path = cached_entries[0]
+            cached_etag = bytes.fromhex(entry_path.rsplit(".", 1)[1]).decode()
+            try:
+                # Revalidate the cached copy, the service responds with 304 Not Modified if the ETag still matches
+                downloader = blob_client.download_blob(etag=cached_etag, match_condition=MatchConditions.IfModified)
+            except HttpResponseError as error:
+                if error.status_code != 304:
+                    raise
+                try:
+                    # Touch the entry to mark it as recently used
+                    os.utime(entry_path)
+                    with open(file=entry_path, mode="rb") as cached_blob:
+                        return cached_blob.read()
+                except FileNotFoundError:
+                    # Another process evicted the entry after it was found
+                    pass
+
+        if downloader is None:
+            downloader = blob_client.download_blob()
+        data = downloader.readall()
+
+        # Write to a temporary file and then move it into place, so other processes never see a partially written entry
+        entry_path = os.path.join(cache_dir, f"{cache_key}.{downloader.properties.etag.encode().hex()}")
+        temp_fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(temp_fd, mode="wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, entry_path)
+
+        # Remove entries for older versions of the blob, then evict the least recently used entries until the cache fits its budget
+        entries = []
+        for entry in os.scandir(cache_dir):
+            if entry.path == entry_path or entry.name.endswith(".tmp"):
+                continue
+            try:
+                if entry.name.startswith(cache_key + "."):
+                    os.remove(entry.path)
+                else:
+                    entry_stat = entry.stat()
+                    entries.append((entry_stat.st_mtime, entry_stat.st_size, entry.path))
+            except FileNotFoundError:
+                pass
+
+        cache_size = len(data) + sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if cache_size <= max_cache_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            cache_size -= size
+
+        return data
+    # </Snippet_download_blob_cached>
+
+    # <Snippet_download_blob_data_packed>
+    def read_packed_blob_index(self, blob_client: BlobClient):
+        # The last 16 bytes of a packed blob hold the record count and a marker, preceded by the (offset, length) index
+        blob_size = blob_client.get_blob_properties().size
+        record_count, marker = struct.unpack("<Q8s", blob_client.download_blob(offset=blob_size - 16, length=16).readall())
+        if marker != b"PACKIDX1":
+            raise ValueError(f"{blob_client.blob_name} is not a packed blob")
+        if record_count == 0:
+            return []
+
+        index_size = record_count * 16
+        index_data = blob_client.download_blob(offset=blob_size - 16 - index_size, length=index_size).readall()
+        values = struct.unpack(f"<{record_count * 2}Q", index_data)
+        return list(zip(values[0::2], values[1::2]))
+
+    def download_packed_record(self, blob_client: BlobClient, index: list, record_number: int):
+        # Only the bytes of the requested record are downloaded
+        offset, length = index[record_number]
+        if length == 0:
+            return b""
+        return blob_client.download_blob(offset=offset, length=length).readall()
+    # </Snippet_download_blob_data_packed>
+
     # <Snippet_download_blob_transfer_options>
     def download_blob_transfer_options(self, account_url: str, container_name: str, blob_name: str):
         # Create a BlobClient object with data transfer options for download
@@ -66,6 +598,60 @@ class BlobSamples(object):
             sample_blob.write(download_stream.readall())
     # </Snippet_download_blob_transfer_options>
 
+    # <Snippet_download_blob_resumable>
+    def download_blob_resumable(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str, local_file_path: str,
+                                chunk_size: int = 1024*1024*4):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        checkpoint_path = local_file_path + ".download-checkpoint"
+
+        while True:
+            properties = blob_client.get_blob_properties()
+            header = json.dumps({"etag": properties.etag, "size": properties.size, "chunk_size": chunk_size})
+
+            # The checkpoint holds a header line followed by the offset of each completed range
+            # Only resume if the checkpoint was written for the same version of the blob
+            completed = set()
+            if os.path.exists(checkpoint_path) and os.path.exists(local_file_path):
+                with open(file=checkpoint_path, mode="r+") as checkpoint:
+                    contents = checkpoint.read()
+                    lines = contents.split("\n")
+                    # The last element is either empty or a partially written line, so it's ignored
+                    if lines[0] == header:
+                        completed = {int(line) for line in lines[1:-1]}
+                        # Cut off the partial line too, otherwise the next offset would be appended to it
+                        checkpoint.truncate(contents.rfind("\n") + 1)
+
+            if not completed:
+                with open(file=checkpoint_path, mode="w") as checkpoint:
+                    checkpoint.write(header + "\n")
+                with open(file=local_file_path, mode="wb") as sample_blob:
+                    sample_blob.truncate(properties.size)
+
+            try:
+                with open(file=local_file_path, mode="r+b") as sample_blob, open(file=checkpoint_path, mode="a") as checkpoint:
+                    for offset in range(0, properties.size, chunk_size):
+                        if offset in completed:
+                            continue
+
+                        # Pin each range to the ETag, so the download fails if the blob changes underneath it
+                        length = min(chunk_size, properties.size - offset)
+                        data = blob_client.download_blob(offset=offset, length=length, etag=properties.etag,
+                                                         match_condition=MatchConditions.IfNotModified).readall()
+                        sample_blob.seek(offset)
+                        sample_blob.write(data)
+                        sample_blob.flush()
+
+                        # Only record the range once its data has been written to the file
+                        checkpoint.write(f"{offset}\n")
+                        checkpoint.flush()
+                break
+            except ResourceModifiedError:
+                # The blob changed during the download, so discard the checkpoint and start again from the new version
+                os.remove(checkpoint_path)
+
+        os.remove(checkpoint_path)
+    # </Snippet_download_blob_resumable>
+
     # <Snippet_download_blob_transfer_validation>
     def download_blob_transfer_validation(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str):
         blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
@@ -75,6 +661,64 @@ class BlobSamples(object):
             sample_blob.write(download_stream.readall())
     # </Snippet_download_blob_transfer_validation>
 
+    # <Snippet_download_blob_transfer_validation_md5>
+    def download_blob_transfer_validation_md5(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str,
+                                              local_file_path: str, chunk_size: int = 1024*1024*4, max_concurrency: int = 4,
+                                              require_md5: bool = True):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        properties = blob_client.get_blob_properties()
+        expected_md5 = properties.content_settings.content_md5
+
+        # Blobs uploaded in blocks only have a whole-blob MD5 if the uploader set content_md5, so say so rather than skip the check
+        if not expected_md5:
+            if require_md5:
+                raise ValueError(f"{blob_name} has no content_md5, so the downloaded content can't be verified as a whole")
+            print(f"{blob_name} has no content_md5, only the MD5 of each range will be verified")
+
+        def download_range(offset: int):
+            # validate_content checks each range as it arrives, so a corrupted range fails right away
+            length = min(chunk_size, properties.size - offset)
+            data = blob_client.download_blob(offset=offset, length=length, etag=properties.etag,
+                                             match_condition=MatchConditions.IfNotModified, validate_content=True).readall()
+            return offset, data
+
+        offsets = iter(range(0, properties.size, chunk_size))
+        file_md5 = hashlib.md5()
+        next_offset = 0
+
+        # Ranges that arrive ahead of the next one to hash wait in the reorder buffer
+        reorder_buffer = {}
+
+        with open(file=local_file_path, mode="wb") as sample_blob, ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            in_flight = set()
+            while True:
+                # Limit the ranges in flight plus those in the reorder buffer, so memory stays bounded
+                while len(in_flight) + len(reorder_buffer) < max_concurrency * 2:
+                    offset = next(offsets, None)
+                    if offset is None:
+                        break
+                    in_flight.add(executor.submit(download_range, offset))
+                if not in_flight:
+                    break
+
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset, data = future.result()
+                    reorder_buffer[offset] = data
+
+                # Hash and write every range that's now contiguous with the data already hashed
+                while next_offset in reorder_buffer:
+                    data = reorder_buffer.pop(next_offset)
+                    file_md5.update(data)
+                    sample_blob.write(data)
+                    next_offset += len(data)
+
+        # The whole-blob MD5 was computed as the ranges arrived, so the file doesn't need to be read again
+        if expected_md5 and file_md5.digest() != bytes(expected_md5):
+            os.remove(local_file_path)
+            raise ValueError(f"MD5 mismatch for {blob_name}: the downloaded content doesn't match content_md5")
+    # </Snippet_download_blob_transfer_validation_md5>
+
 if __name__ == '__main__':
     # TODO: Replace <storage-account-name> with your actual storage account name
     account_url = "https://<storage-account-name>.blob.core.windows.net"
@@ -86,8 +730,19 @@ if __name__ == '__main__':
     sample = BlobSamples()
 
     #sample.download_blob_to_file(blob_service_client, "sample-container")
+    #sample.mirror_container_to_directory(blob_service_client, "sample-container", os.path.join(r'dir_path'), delete_orphans=True)
+    #sample.download_blob_to_file_ranges(blob_service_client, "sample-container", "sample-blob.txt", os.path.join(r'filepath', 'filename'))
     #sample.download_blob_chunks(blob_service_client, "sample-container")
+    #for chunk in sample.download_blob_chunks_prefetch(blob_service_client, "sample-container", "sample-blob.txt"):
+    #    print(len(chunk))
+    #sample.download_blob_chunks_to_sink(blob_service_client, "sample-container", "sample-blob.txt", lambda chunk: print(len(chunk)))
     #sample.download_blob_to_stream(blob_service_client, "sample-container")
+    #sample.download_blob_random_access(blob_service_client, "sample-container", "sample-archive.zip")
     #sample.download_blob_to_string(blob_service_client, "sample-container")
+    #for line in sample.download_blob_text_lines(blob_service_client, "sample-container", "sample-blob.txt"):
+    #    print(line)
+    #sample.download_blob_cached(blob_service_client, "sample-container", "sample-blob.txt")
     sample.download_blob_transfer_options(account_url, "sample-container", "sample-blob.txt")
-    sample.download_blob_transfer_validation(blob_service_client, "sample-container", "sample-blob.txt")
\ No newline at end of file
+    #sample.download_blob_resumable(blob_service_client, "sample-container", "sample-blob.txt", os.path.join(r'file_path', 'file_name'))
+    sample.download_blob_transfer_validation(blob_service_client, "sample-container", "sample-blob.txt")
+    #sample.download_blob_transfer_validation_md5(blob_service_client, "sample-container", "sample-blob.txt", os.path.join(r'file_path', 'file_name'))
\ No newline at end of file
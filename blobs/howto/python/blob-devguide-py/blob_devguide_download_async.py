@@ -2,6 +2,7 @@
 import io
 import asyncio
 import os
+import time
 from azure.identity.aio import DefaultAzureCredential
 from azure.storage.blob.aio import BlobServiceClient, BlobClient
 # </Snippet_imports>
@@ -17,6 +18,93 @@ class BlobSamples(object):
             sample_blob.write(data)
     # </Snippet_download_blob_file>
 
+    # <Snippet_download_blobs_prefix>
+    async def download_blobs_prefix(self, blob_service_client: BlobServiceClient, container_name: str, prefix: str, local_dir_path: str,
+                                    max_concurrency: int = 32):
+        container_client = blob_service_client.get_container_client(container=container_name)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        total_bytes = 0
+        failures = []
+        root = os.path.realpath(local_dir_path)
+
+        def get_local_path(blob_name: str):
+            # Each "/"-separated part of the name becomes one directory or file name, so a part that could climb out of
+            # local_dir_path or restart the path ("..", ".", an empty part, a separator, or a drive) means the blob is skipped
+            segments = blob_name.split("/")
+            for segment in segments:
+                if segment in ("", ".", "..") or os.sep in segment or (os.altsep and os.altsep in segment) \
+                        or os.path.splitdrive(segment)[0]:
+                    return None
+            local_path = os.path.join(root, *segments)
+
+            # The resolved path is checked as well, in case a directory that already exists there is a link to somewhere else
+            if os.path.commonpath([root, os.path.realpath(local_path)]) != root:
+                return None
+            return local_path
+
+        def write_file(path: str, data: bytes):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(file=path, mode="wb") as sample_blob:
+                sample_blob.write(data)
+
+        async def download_blob(blob_name: str, local_path: str):
+            nonlocal total_bytes
+            try:
+                downloader = await container_client.download_blob(blob_name)
+                data = await downloader.readall()
+
+                # Write to disk in the default executor so the event loop isn't blocked on disk I/O
+                await loop.run_in_executor(None, write_file, local_path, data)
+                total_bytes += len(data)
+            except Exception as error:
+                # The listing loop checks for failures as soon as it gets a slot, so this one has to be in the list
+                # before the slot is given back
+                failures.append(error)
+            finally:
+                semaphore.release()
+
+        start = time.perf_counter()
+        blob_count = 0
+        tasks = set()
+        try:
+            async for blob in container_client.list_blobs(name_starts_with=prefix):
+                # Directory marker blobs (names ending in "/") have no file to write
+                if blob.name.endswith("/"):
+                    continue
+                local_path = get_local_path(blob.name)
+                if local_path is None:
+                    print(f"Skipping {blob.name!r}, the name isn't a safe local path")
+                    continue
+
+                # Wait for a free slot before starting each download, which also pauses listing when all slots are busy
+                await semaphore.acquire()
+                if failures:
+                    break
+
+                task = asyncio.create_task(download_blob(blob.name, local_path))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                blob_count += 1
+
+            # Wait for the remaining downloads, stopping at the first failure
+            while tasks and not failures:
+                await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # After a failure, or if this call is itself cancelled, the downloads in progress are cancelled and awaited,
+            # so no task is still writing files once the call has returned
+            pending = list(tasks)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if failures:
+            raise failures[0]
+
+        elapsed = max(time.perf_counter() - start, 1e-6)
+        print(f"Downloaded {blob_count} blobs ({total_bytes} bytes) in {elapsed:.2f}s, {total_bytes / elapsed / (1024*1024):.2f} MiB/s")
+    # </Snippet_download_blobs_prefix>
+
     # <Snippet_download_blob_chunks>
     async def download_blob_chunks(self, blob_service_client: BlobServiceClient, container_name):
         blob_client = blob_service_client.get_blob_client(container=container_name, blob="sample-blob.txt")
@@ -1,8 +1,98 @@
 # <Snippet_imports>
+import heapq
+import itertools
+import queue
+import sqlite3
+import threading
+import uuid
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import datetime, timezone
 from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobServiceClient, ContainerClient, BlobPrefix
+from azure.storage.blob import BlobServiceClient, ContainerClient, BlobPrefix, BlobProperties, ContentSettings
 # </Snippet_imports>
 
+# <Snippet_compact_blob_list>
+class CompactBlobList(object):
+    # Listing results are stored column by column, so each blob costs tens of bytes instead of a full BlobProperties object
+    def __init__(self):
+        # Names and ETags are packed into UTF-8 buffers, with the offset where each value ends
+        self._names = bytearray()
+        self._name_ends = array("Q")
+        self._etags = bytearray()
+        self._etag_ends = array("Q")
+        self._sizes = array("q")
+        self._last_modified = array("d")
+        # MD5 hashes are 16 bytes each, with zeros for blobs that don't have one
+        self._content_md5s = bytearray()
+        self._has_content_md5 = array("B")
+        # Values that repeat across many blobs, like the container and access tier, are stored once and blobs only
+        # hold their index
+        self._values = {column: [] for column in ("container", "blob_type", "blob_tier", "content_type")}
+        self._value_codes = {column: {} for column in self._values}
+        self._codes = {column: array("H") for column in self._values}
+
+    def _append_code(self, column, value):
+        codes = self._value_codes[column]
+        if value not in codes:
+            codes[value] = len(self._values[column])
+            self._values[column].append(value)
+        self._codes[column].append(codes[value])
+
+    def append(self, blob: BlobProperties):
+        self._names += blob.name.encode("utf-8")
+        self._name_ends.append(len(self._names))
+        self._etags += (blob.etag or "").encode("utf-8")
+        self._etag_ends.append(len(self._etags))
+        self._sizes.append(blob.size)
+        self._last_modified.append(blob.last_modified.timestamp())
+
+        content_md5 = blob.content_settings.content_md5
+        self._content_md5s += bytes(content_md5) if content_md5 else bytes(16)
+        self._has_content_md5.append(1 if content_md5 else 0)
+
+        self._append_code("container", blob.container)
+        self._append_code("blob_type", blob.blob_type)
+        self._append_code("blob_tier", blob.blob_tier)
+        self._append_code("content_type", blob.content_settings.content_type)
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def __getitem__(self, index):
+        # BlobProperties objects are only created when they're accessed
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if not isinstance(index, int):
+            raise TypeError(f"CompactBlobList indices must be integers or slices, not {type(index).__name__}")
+        index = range(len(self))[index]
+
+        blob = BlobProperties()
+        name_start = self._name_ends[index - 1] if index else 0
+        blob.name = self._names[name_start:self._name_ends[index]].decode("utf-8")
+        etag_start = self._etag_ends[index - 1] if index else 0
+        blob.etag = self._etags[etag_start:self._etag_ends[index]].decode("utf-8") or None
+        blob.size = self._sizes[index]
+        blob.last_modified = datetime.fromtimestamp(self._last_modified[index], timezone.utc)
+        blob.container = self._values["container"][self._codes["container"][index]]
+        blob.blob_type = self._values["blob_type"][self._codes["blob_type"][index]]
+        blob.blob_tier = self._values["blob_tier"][self._codes["blob_tier"][index]]
+        blob.content_settings = ContentSettings(
+            content_type=self._values["content_type"][self._codes["content_type"][index]],
+            content_md5=bytearray(self._content_md5s[index * 16:index * 16 + 16]) if self._has_content_md5[index] else None)
+        return blob
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def fetch_blob_properties(self, container_client: ContainerClient, index):
+        # Properties that aren't kept in the list, like metadata, need a request to the service for each blob
+        return container_client.get_blob_client(self[index].name).get_blob_properties()
+# </Snippet_compact_blob_list>
+
 class BlobSamples(object):
 
     # <Snippet_list_blobs_flat>
@@ -25,6 +115,232 @@ class BlobSamples(object):
             print(f"Name: {blob['name']}, Tags: {blob['tags']}")
     # </Snippet_list_blobs_flat_options> 
 
+    # <Snippet_list_blobs_flat_partitioned>
+    def list_blobs_flat_partitioned(self, blob_service_client: BlobServiceClient, container_name, max_concurrency=8, ordered=False):
+        container_client = blob_service_client.get_container_client(container=container_name)
+        stop = threading.Event()
+        lock = threading.Lock()
+        active_partitions = 0
+        waiting_partitions = 0
+
+        # Workers take the pending partition that comes first in name order, so that with ordering they stay close to
+        # the partition the caller is reading, rather than fill the queues of partitions far ahead of it
+        pending_partitions = []
+        submit_order = itertools.count()
+
+        # Without ordering, every partition sends its pages to one queue, so pages are emitted as soon as any partition returns them
+        shared_queue = None if ordered else queue.Queue(maxsize=max_concurrency * 4)
+
+        def new_partition(prefix, start_from=None):
+            # A partition lists the names that start with prefix, from start_from onwards if it's set
+            # With ordering, each partition has its own bounded queue, so partitions listed ahead of the current one
+            # can't use unbounded memory
+            return {"prefix": prefix, "start_from": start_from, "children": [], "claimed": False,
+                    "pages": shared_queue if shared_queue else queue.Queue(maxsize=8)}
+
+        def put(page_queue, item):
+            # A worker waiting for room in a page queue checks whether the caller has closed the generator, so closing it
+            # part way through never leaves a worker stuck
+            while not stop.is_set():
+                try:
+                    page_queue.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def split(partition, last_name):
+            # The rest of the partition is split on the character that follows its prefix: the partition keeps the names
+            # that share last_name's next character, and a new partition is started for each printable ASCII character
+            # after it, plus one for every name whose next character is beyond ASCII
+            prefix = partition["prefix"]
+            if len(last_name) <= len(prefix) or ord(last_name[len(prefix)]) >= 0x7f:
+                return
+            next_char = last_name[len(prefix)]
+            children = [new_partition(prefix + chr(code)) for code in range(ord(next_char) + 1, 0x7f)]
+            children.append(new_partition(prefix, start_from=prefix + "\x7f"))
+            partition["prefix"] = prefix + next_char
+
+            # The new partitions follow the rest of this one in name order, and come before those from any earlier split
+            partition["children"][:0] = children
+            if shared_queue:
+                put(shared_queue, len(children))
+            for child in children:
+                submit(child)
+
+        def list_pages(partition):
+            pages = container_client.list_blobs(name_starts_with=partition["prefix"], start_from=partition["start_from"]).by_page()
+            for page in pages:
+                blobs = list(page)
+
+                # After a split, the partition ends at the first name that doesn't start with its narrowed prefix
+                prefix = partition["prefix"]
+                if blobs and not blobs[-1].name.startswith(prefix):
+                    yield [blob for blob in blobs if blob.name.startswith(prefix)]
+                    return
+                yield blobs
+
+                # A partition with more pages to come is split while there are workers to spare, so that
+                # large ranges, and containers with no virtual directories at all, are listed in parallel
+                if pages.continuation_token and blobs and active_partitions - waiting_partitions < max_concurrency:
+                    split(partition, blobs[-1].name)
+
+        def claim(partition):
+            with lock:
+                claimed = partition["claimed"]
+                partition["claimed"] = True
+            return not claimed
+
+        def run_partition():
+            nonlocal active_partitions, waiting_partitions
+            with lock:
+                partition = heapq.heappop(pending_partitions)[-1]
+            try:
+                if claim(partition):
+                    for blobs in list_pages(partition):
+                        # A worker that's waiting for the caller to catch up isn't counted as busy when deciding to split
+                        with lock:
+                            waiting_partitions += 1
+                        put(partition["pages"], blobs)
+                        with lock:
+                            waiting_partitions -= 1
+                        if stop.is_set():
+                            return
+                    put(partition["pages"], None)
+            except Exception as error:
+                put(partition["pages"], error)
+            finally:
+                with lock:
+                    active_partitions -= 1
+
+        def submit(partition):
+            nonlocal active_partitions
+            with lock:
+                active_partitions += 1
+                heapq.heappush(pending_partitions, (partition["start_from"] or partition["prefix"], next(submit_order), partition))
+            executor.submit(run_partition)
+
+        def get_pages(page_queue):
+            while True:
+                page = page_queue.get()
+                if page is None:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+
+        def get_ordered(partition):
+            if claim(partition):
+                # No worker has started this partition yet, so list it here, rather than wait for a worker that
+                # could be busy with a partition that comes later in name order
+                for blobs in list_pages(partition):
+                    yield from blobs
+            else:
+                for blobs in get_pages(partition["pages"]):
+                    yield from blobs
+            for child in partition["children"]:
+                yield from get_ordered(child)
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            # Listing starts with the whole container as one partition, which is split as its pages come back
+            root = new_partition("")
+            if ordered:
+                yield from get_ordered(root)
+            else:
+                submit(root)
+                remaining = 1
+                while remaining:
+                    item = shared_queue.get()
+                    if item is None:
+                        remaining -= 1
+                    elif isinstance(item, int):
+                        remaining += item
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield from item
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    # </Snippet_list_blobs_flat_partitioned>
+
+    # <Snippet_list_blobs_flat_compact>
+    def list_blobs_flat_compact(self, blob_service_client: BlobServiceClient, container_name):
+        container_client = blob_service_client.get_container_client(container=container_name)
+
+        # Only the compact record of each blob is kept, so the BlobProperties objects from each page can be freed
+        blob_list = CompactBlobList()
+        for blob in container_client.list_blobs():
+            blob_list.append(blob)
+
+        print(f"Number of blobs: {len(blob_list)}")
+        for blob in blob_list:
+            print(f"Name: {blob.name}, Size: {blob.size}, Tier: {blob.blob_tier}")
+
+        return blob_list
+    # </Snippet_list_blobs_flat_compact>
+
+    # <Snippet_list_blobs_inventory>
+    def refresh_blob_inventory(self, blob_service_client: BlobServiceClient, container_name, inventory_path=None):
+        container_client = blob_service_client.get_container_client(container=container_name)
+        inventory_path = inventory_path or f"{container_name}_inventory.db"
+
+        with closing(sqlite3.connect(inventory_path)) as inventory:
+            inventory.executescript("""
+                CREATE TABLE IF NOT EXISTS blobs (name TEXT PRIMARY KEY, size INTEGER, tier TEXT, last_modified TEXT, scan_id TEXT);
+                CREATE INDEX IF NOT EXISTS blobs_tier_size ON blobs (tier, size);
+                CREATE INDEX IF NOT EXISTS blobs_last_modified ON blobs (last_modified);
+                CREATE TABLE IF NOT EXISTS blob_tags (name TEXT, key TEXT, value TEXT, PRIMARY KEY (name, key));
+                CREATE INDEX IF NOT EXISTS blob_tags_key_value ON blob_tags (key, value);
+                CREATE TABLE IF NOT EXISTS scan_state (id INTEGER PRIMARY KEY, scan_id TEXT, continuation_token TEXT);
+            """)
+
+            # Resume an interrupted scan from its saved page token, otherwise start a new scan
+            state = inventory.execute("SELECT scan_id, continuation_token FROM scan_state WHERE id = 0").fetchone()
+            if state and state[1]:
+                scan_id, continuation_token = state
+            else:
+                scan_id, continuation_token = uuid.uuid4().hex, None
+
+            pages = container_client.list_blobs(include=['tags']).by_page(continuation_token=continuation_token)
+            for page in pages:
+                blobs = list(page)
+                inventory.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?)",
+                                      [(blob.name, blob.size, blob.blob_tier, blob.last_modified.isoformat(), scan_id) for blob in blobs])
+                inventory.executemany("DELETE FROM blob_tags WHERE name = ?", [(blob.name,) for blob in blobs])
+                inventory.executemany("INSERT INTO blob_tags VALUES (?, ?, ?)",
+                                      [(blob.name, key, value) for blob in blobs for key, value in (blob.tags or {}).items()])
+
+                # Save the token for the next page along with this page, so an interrupted refresh picks up where it stopped
+                inventory.execute("INSERT OR REPLACE INTO scan_state VALUES (0, ?, ?)", (scan_id, pages.continuation_token))
+                inventory.commit()
+
+            # The scan is complete, so blobs that weren't seen in it have been deleted from the container
+            inventory.execute("DELETE FROM blob_tags WHERE name IN (SELECT name FROM blobs WHERE scan_id != ?)", (scan_id,))
+            inventory.execute("DELETE FROM blobs WHERE scan_id != ?", (scan_id,))
+            inventory.execute("INSERT OR REPLACE INTO scan_state VALUES (0, ?, NULL)", (scan_id,))
+            inventory.commit()
+
+    def query_blob_inventory(self, container_name, prefix="", min_size=0, tier=None, tag=None, inventory_path=None):
+        inventory_path = inventory_path or f"{container_name}_inventory.db"
+
+        # A range on the primary key finds every blob under the prefix without scanning the whole table
+        query = "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs WHERE name >= ? AND name < ? AND size >= ?"
+        parameters = [prefix, prefix + "\U0010ffff", min_size]
+        if tier is not None:
+            query += " AND tier = ?"
+            parameters.append(tier)
+        if tag is not None:
+            query += " AND EXISTS (SELECT 1 FROM blob_tags WHERE blob_tags.name = blobs.name AND key = ? AND value = ?)"
+            parameters.extend(tag)
+
+        with closing(sqlite3.connect(inventory_path)) as inventory:
+            count, total_size = inventory.execute(query, parameters).fetchone()
+
+        print(f"Blobs: {count}, total size: {total_size} bytes")
+        return count, total_size
+    # </Snippet_list_blobs_inventory>
+
     # <Snippet_list_blobs_hierarchical>
     depth = 0
     indent = "  "
@@ -40,6 +356,62 @@ class BlobSamples(object):
                 print(f"{self.indent * self.depth}{blob.name}")
     # </Snippet_list_blobs_hierarchical> 
 
+    # <Snippet_list_blobs_hierarchical_concurrent>
+    def list_blobs_hierarchical_concurrent(self, container_client: ContainerClient, prefix="", max_concurrency=8):
+        # Each item is returned through a bounded queue along with its depth, so no shared depth counter is needed
+        results = queue.Queue(maxsize=1000)
+        # Prefixes waiting to be listed can't be bounded: listings only finish if their results are read, so the loop
+        # below has to keep reading results, and hold on to the prefixes they contain, while every listing is in flight
+        pending_prefixes = deque([(prefix, 0)])
+        active_listings = 0
+        stop = threading.Event()
+
+        def put(result):
+            # Once the caller stops reading the walk, a listing thread stops trying to hand over its items
+            while not stop.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def list_prefix(prefix, depth):
+            try:
+                for item in container_client.walk_blobs(name_starts_with=prefix, delimiter='/'):
+                    put((depth, item))
+                    if stop.is_set():
+                        return
+                put(None)
+            except Exception as error:
+                put(error)
+
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            while True:
+                # Directories are walked breadth-first without recursion, with up to max_concurrency listings in flight
+                # Items from different listings are interleaved, so they aren't in tree order: each item's name is its full
+                # path, and depth is the number of directories below the starting prefix
+                while pending_prefixes and active_listings < max_concurrency:
+                    executor.submit(list_prefix, *pending_prefixes.popleft())
+                    active_listings += 1
+                if not active_listings:
+                    break
+
+                result = results.get()
+                if result is None:
+                    active_listings -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    depth, item = result
+                    if isinstance(item, BlobPrefix):
+                        pending_prefixes.append((item.name, depth + 1))
+                    yield depth, item
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    # </Snippet_list_blobs_hierarchical_concurrent>
+
 if __name__ == '__main__':
     # TODO: Replace <storage-account-name> with your actual storage account name
     account_url = "https://<storage-account-name>.blob.core.windows.net"
@@ -53,5 +425,15 @@ if __name__ == '__main__':
     sample.list_blobs_flat(blob_service_client, "sample-container")
     sample.list_blobs_flat_options(blob_service_client, "sample-container")
 
+    #sample.list_blobs_flat_compact(blob_service_client, "sample-container")
+    #sample.refresh_blob_inventory(blob_service_client, "sample-container")
+    #sample.query_blob_inventory("sample-container", prefix="x/", min_size=1024*1024*1024, tier="Cool")
+
+    #for blob in sample.list_blobs_flat_partitioned(blob_service_client, "sample-container", ordered=True):
+    #    print(f"Name: {blob.name}")
+
     container_client = blob_service_client.get_container_client(container="sample-container")
-    sample.list_blobs_hierarchical(container_client, "")
\ No newline at end of file
+    sample.list_blobs_hierarchical(container_client, "")
+
+    #for depth, blob in sample.list_blobs_hierarchical_concurrent(container_client):
+    #    print(f"Depth {depth}: {blob.name}")
\ No newline at end of file
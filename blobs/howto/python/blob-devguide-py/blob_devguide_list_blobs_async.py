@@ -1,5 +1,6 @@
 # <Snippet_imports>
 import asyncio
+from collections import deque
 from azure.identity.aio import DefaultAzureCredential
 from azure.storage.blob.aio import BlobServiceClient, ContainerClient, BlobPrefix
 # </Snippet_imports>
@@ -37,6 +38,52 @@ class BlobSamples(object):
                 print(f"{self.indent * self.depth}{blob.name}")
     # </Snippet_list_blobs_hierarchical> 
 
+    # <Snippet_list_blobs_hierarchical_concurrent>
+    async def list_blobs_hierarchical_concurrent(self, container_client: ContainerClient, prefix="", max_concurrency=8):
+        # Listing tasks send each item with its depth, through a queue that suspends them while it's full
+        results = asyncio.Queue(maxsize=1000)
+        # There's no limit on prefixes waiting for a task: a listing task can only finish once its items have been taken
+        # from the queue, so the loop has to keep taking them, and keep the prefixes among them, while all tasks are running
+        pending_prefixes = deque([(prefix, 0)])
+        active_listings = 0
+        tasks = set()
+
+        async def list_prefix(prefix, depth):
+            try:
+                async for item in container_client.walk_blobs(name_starts_with=prefix, delimiter='/'):
+                    await results.put((depth, item))
+                await results.put(None)
+            except Exception as error:
+                await results.put(error)
+
+        try:
+            while True:
+                # Each prefix found is listed by a new task, up to max_concurrency at a time, in the order the prefixes were found
+                # Items arrive in the order the tasks produce them rather than in tree order, so use each item's full name,
+                # with depth counting the directories below the starting prefix
+                while pending_prefixes and active_listings < max_concurrency:
+                    task = asyncio.create_task(list_prefix(*pending_prefixes.popleft()))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    active_listings += 1
+                if not active_listings:
+                    break
+
+                result = await results.get()
+                if result is None:
+                    active_listings -= 1
+                elif isinstance(result, Exception):
+                    raise result
+                else:
+                    depth, item = result
+                    if isinstance(item, BlobPrefix):
+                        pending_prefixes.append((item.name, depth + 1))
+                    yield depth, item
+        finally:
+            for task in tasks:
+                task.cancel()
+    # </Snippet_list_blobs_hierarchical_concurrent>
+
 # <Snippet_create_client_async>
 async def main():
     sample = BlobSamples()
@@ -1,9 +1,31 @@
 # <Snippet_imports>
+import hashlib
 import io
+import itertools
+import json
+import mmap
 import os
+import queue
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
 import uuid
+import zlib
+from collections import Counter, deque
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+from azure.core.exceptions import ResourceNotFoundError
 from azure.identity import DefaultAzureCredential
-from azure.storage.blob import BlobServiceClient, ContainerClient, BlobBlock, BlobClient, StandardBlobTier
+from azure.storage.blob import BlobServiceClient, ContainerClient, BlobBlock, BlobClient, StandardBlobTier, ContentSettings
+
+# zstd compression is used when the optional zstandard package is installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 # </Snippet_imports>
 
 class BlobSamples(object):
@@ -17,6 +39,39 @@ class BlobSamples(object):
         blob_client.upload_blob(data, blob_type="BlockBlob")
     # </Snippet_upload_blob_data>
 
+    # <Snippet_upload_blob_data_packed>
+    def upload_blob_data_packed(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str, records,
+                                block_size: int = 1024*1024*4):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+        block_id_list = []
+        index = []
+        buffer = bytearray()
+        offset = 0
+
+        def stage_buffer():
+            block_id = uuid.uuid4().hex
+            block_id_list.append(BlobBlock(block_id=block_id))
+            blob_client.stage_block(block_id=block_id, data=bytes(buffer), length=len(buffer))
+
+        # Many small records are appended into each block, so one request carries thousands of records
+        for record in records:
+            index.append((offset, len(record)))
+            offset += len(record)
+            buffer += record
+
+            if len(buffer) >= block_size:
+                stage_buffer()
+                buffer = bytearray()
+
+        # The footer holds the (offset, length) index, then the record count and a marker, so readers can find it from the end of the blob
+        buffer += struct.pack(f"<{len(index) * 2}Q", *itertools.chain.from_iterable(index))
+        buffer += struct.pack("<Q8s", len(index), b"PACKIDX1")
+        stage_buffer()
+
+        blob_client.commit_block_list(block_id_list)
+        return index
+    # </Snippet_upload_blob_data_packed>
+
     # <Snippet_upload_blob_stream>        
     def upload_blob_stream(self, blob_service_client: BlobServiceClient, container_name: str):
         blob_client = blob_service_client.get_blob_client(container=container_name, blob="sample-blob.txt")
@@ -24,6 +79,88 @@ class BlobSamples(object):
         blob_client.upload_blob(input_stream, blob_type="BlockBlob")
     # </Snippet_upload_blob_stream>
 
+    # <Snippet_upload_blob_stream_compressed>
+    def upload_blob_stream_compressed(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str,
+                                      input_stream: io.IOBase, chunk_size: int = 1024*1024*4, compress_in_thread: bool = True,
+                                      compression_level: int = None, max_queued_bytes: int = 1024*1024*16, max_concurrency: int = 2):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
+
+        # Use zstd if it's available, otherwise fall back to gzip
+        # The default levels are the fast ones, so compression keeps up with the upload rather than becoming the bottleneck
+        if zstandard is not None:
+            content_encoding = "zstd"
+            compressor = zstandard.ZstdCompressor(level=3 if compression_level is None else compression_level).compressobj()
+        else:
+            content_encoding = "gzip"
+            compressor = zlib.compressobj(1 if compression_level is None else compression_level, wbits=31) # 31 selects the gzip container format
+
+        def compressed_chunks():
+            while True:
+                chunk = input_stream.read(chunk_size)
+                if not chunk:
+                    break
+                compressed = compressor.compress(chunk)
+                if compressed:
+                    yield compressed
+            yield compressor.flush()
+
+        def threaded_chunks():
+            # Compress in a worker thread so compression overlaps with the upload
+            # Read-ahead is capped by the compressed bytes waiting in the queue rather than by the number of chunks,
+            # since chunks of compressible data are much smaller than the blocks the upload stages
+            chunk_queue = deque()
+            condition = threading.Condition()
+            queued_bytes = 0
+            stopped = False
+
+            def put(item):
+                nonlocal queued_bytes
+                with condition:
+                    # The worker also stops waiting if the upload stops reading chunks
+                    condition.wait_for(lambda: stopped or queued_bytes < max_queued_bytes)
+                    if stopped:
+                        return
+                    chunk_queue.append(item)
+                    if isinstance(item, bytes):
+                        queued_bytes += len(item)
+                    condition.notify_all()
+
+            def compress_worker():
+                try:
+                    for compressed in compressed_chunks():
+                        put(compressed)
+                        if stopped:
+                            return
+                    put(None)
+                except Exception as error:
+                    put(error)
+
+            threading.Thread(target=compress_worker, daemon=True).start()
+            try:
+                while True:
+                    with condition:
+                        condition.wait_for(lambda: chunk_queue)
+                        item = chunk_queue.popleft()
+                        if isinstance(item, bytes):
+                            queued_bytes -= len(item)
+                        condition.notify_all()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                with condition:
+                    stopped = True
+                    condition.notify_all()
+
+        # The blob is uploaded from a generator, so neither the raw nor the compressed data is held in memory all at once
+        # Closing the generator stops the compression worker if the upload fails part way through
+        with closing(threaded_chunks() if compress_in_thread else compressed_chunks()) as data:
+            blob_client.upload_blob(data, blob_type="BlockBlob", overwrite=True, max_concurrency=max_concurrency,
+                                    content_settings=ContentSettings(content_encoding=content_encoding))
+    # </Snippet_upload_blob_stream_compressed>
+
     # <Snippet_upload_blob_file>
     def upload_blob_file(self, blob_service_client: BlobServiceClient, container_name: str):
         container_client = blob_service_client.get_container_client(container=container_name)
@@ -31,6 +168,100 @@ class BlobSamples(object):
             blob_client = container_client.upload_blob(name="sample-blob.txt", data=data, overwrite=True)
     # </Snippet_upload_blob_file>
 
+    # <Snippet_upload_blob_directory>
+    def upload_blob_directory(self, account_url: str, container_name: str, local_dir_path: str, max_workers: int = 16,
+                              large_file_size: int = 1024*1024*32, max_queued_files: int = 10000, progress: Counter = None):
+        credential = DefaultAzureCredential()
+        progress = Counter() if progress is None else progress
+        progress_lock = threading.Lock()
+        worker_state = threading.local()
+
+        def get_container_client():
+            # Each worker creates one client and reuses it, along with its connection pool, for every file it uploads
+            if not hasattr(worker_state, "container_client"):
+                worker_state.container_client = ContainerClient(account_url=account_url, container_name=container_name, credential=credential)
+            return worker_state.container_client
+
+        def scan_directory(path: str):
+            files, directories = [], []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files.append((entry.path, entry.stat().st_size))
+            return files, directories
+
+        def upload_file(path: str, size: int, max_concurrency: int):
+            blob_name = os.path.relpath(path, local_dir_path).replace(os.sep, "/")
+            with open(file=path, mode="rb") as data:
+                get_container_client().upload_blob(name=blob_name, data=data, overwrite=True, max_concurrency=max_concurrency)
+            with progress_lock:
+                progress["files_uploaded"] += 1
+                progress["bytes_uploaded"] += size
+
+        # Small and large files are uploaded in separate lanes, each with its own bounded queue and its own worker threads
+        # The max_workers threads are split between the lanes, a quarter of them for large files, which upload 4 blocks at a time
+        large_file_workers = max(1, max_workers // 4)
+        small_file_workers = max(1, max_workers - large_file_workers)
+        lanes = [{"workers": small_file_workers, "max_concurrency": 1, "queue": queue.Queue(maxsize=max_queued_files)},
+                 {"workers": large_file_workers, "max_concurrency": 4, "queue": queue.Queue(maxsize=max_queued_files)}]
+        small_file_lane, large_file_lane = lanes
+        failures = []
+        stop = threading.Event()
+
+        def lane_worker(lane: dict):
+            while True:
+                item = lane["queue"].get()
+                if item is None:
+                    return
+                # Once an upload has failed, the files still queued are dropped instead of uploaded
+                if stop.is_set():
+                    continue
+                try:
+                    upload_file(*item, lane["max_concurrency"])
+                except Exception as error:
+                    failures.append(error)
+                    stop.set()
+
+        threads = [threading.Thread(target=lane_worker, args=(lane,), daemon=True) for lane in lanes for _ in range(lane["workers"])]
+        for thread in threads:
+            thread.start()
+        try:
+            with ThreadPoolExecutor(max_workers=4) as scan_pool:
+                pending_scans = {scan_pool.submit(scan_directory, local_dir_path)}
+
+                # Directories are scanned in parallel, and files are queued for upload as soon as they're found
+                # A queued file is only its path and size, so each lane can queue many of them: a lane only holds up
+                # the scan, and with it the other lane, once it's max_queued_files behind
+                while pending_scans and not stop.is_set():
+                    done, pending_scans = wait(pending_scans, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        files, directories = future.result()
+                        pending_scans.update(scan_pool.submit(scan_directory, directory) for directory in directories)
+
+                        for path, size in files:
+                            with progress_lock:
+                                progress["files_found"] += 1
+                                progress["bytes_found"] += size
+                            lane = small_file_lane if size < large_file_size else large_file_lane
+                            lane["queue"].put((path, size))
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            # Each worker stops when it reaches the end of its lane's queue, after the files queued before it
+            for lane in lanes:
+                for _ in range(lane["workers"]):
+                    lane["queue"].put(None)
+            for thread in threads:
+                thread.join()
+
+        if failures:
+            raise failures[0]
+        return progress
+    # </Snippet_upload_blob_directory>
+
     # <Snippet_upload_blob_tags>
     def upload_blob_tags(self, blob_service_client: BlobServiceClient, container_name: str):
         container_client = blob_service_client.get_container_client(container=container_name)
@@ -39,6 +270,46 @@ class BlobSamples(object):
             blob_client = container_client.upload_blob(name="sample-blob.txt", data=data, tags=sample_tags)
     # </Snippet_upload_blob_tags>
 
+    # <Snippet_upload_blob_file_incremental>
+    def upload_blob_file_incremental(self, blob_service_client: BlobServiceClient, container_name: str, local_file_path: str,
+                                     manifest_path: str = "upload_manifest.db", tags: dict = None):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=os.path.basename(local_file_path))
+        local_path = os.path.abspath(local_file_path)
+        file_stat = os.stat(local_path)
+
+        with closing(sqlite3.connect(manifest_path)) as manifest:
+            manifest.execute("CREATE TABLE IF NOT EXISTS uploads (path TEXT, blob_url TEXT, size INTEGER, mtime_ns INTEGER, "
+                             "sha256 TEXT, etag TEXT, PRIMARY KEY (path, blob_url))")
+            row = manifest.execute("SELECT size, mtime_ns, sha256 FROM uploads WHERE path = ? AND blob_url = ?",
+                                   (local_path, blob_client.url)).fetchone()
+
+            # If the size and modification time match the last upload, skip the file without reading it
+            if row and row[0] == file_stat.st_size and row[1] == file_stat.st_mtime_ns:
+                return False
+
+            sha256 = hashlib.sha256()
+            with open(file=local_path, mode="rb") as data:
+                for chunk in iter(lambda: data.read(1024*1024*4), b""):
+                    sha256.update(chunk)
+            content_hash = sha256.hexdigest()
+
+            # The file was touched but its content is the same, so only the manifest needs to be updated
+            if row and row[0] == file_stat.st_size and row[2] == content_hash:
+                manifest.execute("UPDATE uploads SET mtime_ns = ? WHERE path = ? AND blob_url = ?",
+                                 (file_stat.st_mtime_ns, local_path, blob_client.url))
+                manifest.commit()
+                return False
+
+            with open(file=local_path, mode="rb") as data:
+                upload_result = blob_client.upload_blob(data=data, overwrite=True, tags=tags)
+
+            # Record the uploaded file against the ETag of the blob it was uploaded to
+            manifest.execute("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                             (local_path, blob_client.url, file_stat.st_size, file_stat.st_mtime_ns, content_hash, upload_result["etag"]))
+            manifest.commit()
+            return True
+    # </Snippet_upload_blob_file_incremental>
+
     # <Snippet_upload_blob_blocks>
     def upload_blocks(self, blob_container_client: ContainerClient, local_file_path: str, block_size: int):
         file_name = os.path.basename(local_file_path)
@@ -60,6 +331,114 @@ class BlobSamples(object):
             blob_client.commit_block_list(block_id_list)
     # </Snippet_upload_blob_blocks>
 
+    # <Snippet_upload_blob_blocks_concurrent>
+    def upload_blocks_concurrent(self, blob_container_client: ContainerClient, local_file_path: str, block_size: int,
+                                 max_concurrency: int = 8, max_buffered_bytes: int = 1024*1024*64):
+        file_name = os.path.basename(local_file_path)
+        blob_client = blob_container_client.get_blob_client(file_name)
+
+        # Limit the number of blocks held in memory by both block count and total buffered bytes
+        max_in_flight = max(1, min(max_concurrency * 2, max_buffered_bytes // block_size))
+
+        with open(file=local_file_path, mode="rb") as file_stream, \
+                ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            block_id_list = []
+            in_flight = set()
+
+            while True:
+                buffer = file_stream.read(block_size)
+                if not buffer:
+                    break
+
+                # The block list is built in file order, regardless of the order in which the blocks finish staging
+                block_id = uuid.uuid4().hex
+                block_id_list.append(BlobBlock(block_id=block_id))
+
+                in_flight.add(executor.submit(blob_client.stage_block, block_id=block_id, data=buffer, length=len(buffer)))
+
+                # Wait for a staged block to complete before reading the next one
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+
+            for future in wait(in_flight).done:
+                future.result()
+
+            blob_client.commit_block_list(block_id_list)
+    # </Snippet_upload_blob_blocks_concurrent>
+
+    # <Snippet_upload_blob_blocks_mmap>
+    def upload_blocks_mmap(self, blob_container_client: ContainerClient, local_file_path: str, block_size: int):
+        file_name = os.path.basename(local_file_path)
+        blob_client = blob_container_client.get_blob_client(file_name)
+
+        with open(file=local_file_path, mode="rb") as file_stream:
+            block_id_list = []
+
+            # An empty file can't be memory-mapped, so only map the file if it has content
+            if os.fstat(file_stream.fileno()).st_size > 0:
+                # Each block is a memoryview slice of the mapped file, so no bytes are copied before the request is sent
+                with mmap.mmap(file_stream.fileno(), length=0, access=mmap.ACCESS_READ) as file_map, \
+                        memoryview(file_map) as file_view:
+                    for offset in range(0, len(file_view), block_size):
+                        with file_view[offset:offset + block_size] as block:
+                            block_id = uuid.uuid4().hex
+                            block_id_list.append(BlobBlock(block_id=block_id))
+
+                            blob_client.stage_block(block_id=block_id, data=block, length=len(block))
+
+            blob_client.commit_block_list(block_id_list)
+    # </Snippet_upload_blob_blocks_mmap>
+
+    # <Snippet_upload_blob_blocks_resumable>
+    def upload_blocks_resumable(self, blob_container_client: ContainerClient, local_file_path: str, block_size: int):
+        file_name = os.path.basename(local_file_path)
+        blob_client = blob_container_client.get_blob_client(file_name)
+
+        # The journal records the IDs of blocks staged by a previous, interrupted upload
+        journal_path = local_file_path + ".upload-journal"
+        staged_block_ids = set()
+        if os.path.exists(journal_path):
+            with open(file=journal_path, mode="r") as journal:
+                staged_block_ids = set(journal.read().split())
+
+        # Only skip blocks that the service still holds as uncommitted blocks
+        if staged_block_ids:
+            try:
+                _, uncommitted_blocks = blob_client.get_block_list(block_list_type="uncommitted")
+                staged_block_ids &= {block.id for block in uncommitted_blocks}
+            except ResourceNotFoundError:
+                staged_block_ids = set()
+
+        with open(file=local_file_path, mode="rb") as file_stream, open(file=journal_path, mode="a") as journal:
+            block_id_list = []
+            offset = 0
+
+            while True:
+                buffer = file_stream.read(block_size)
+                if not buffer:
+                    break
+
+                # Derive the block ID from the offset and content so a retry produces the same ID for the same block
+                block_id = f"{offset:016x}-{hashlib.sha256(buffer).hexdigest()[:32]}"
+                block_id_list.append(BlobBlock(block_id=block_id))
+                offset += len(buffer)
+
+                if block_id in staged_block_ids:
+                    continue
+
+                blob_client.stage_block(block_id=block_id, data=buffer, length=len(buffer))
+
+                journal.write(block_id + "\n")
+                journal.flush()
+
+            blob_client.commit_block_list(block_id_list)
+
+        # The upload is complete, so the journal is no longer needed
+        os.remove(journal_path)
+    # </Snippet_upload_blob_blocks_resumable>
+
     # <Snippet_upload_blob_transfer_options>
     def upload_blob_transfer_options(self, account_url: str, container_name: str, blob_name: str):
         # Create a BlobClient object with data transfer options for upload
@@ -76,6 +455,119 @@ class BlobSamples(object):
             blob_client = blob_client.upload_blob(data=data, overwrite=True, max_concurrency=2)
     # </Snippet_upload_blob_transfer_options>
 
+    # <Snippet_upload_blob_transfer_options_autotune>
+    def upload_blob_transfer_options_autotune(self, blob_service_client: BlobServiceClient, container_name: str, local_file_path: str,
+                                              profile_path: str = os.path.join(os.path.expanduser("~"), ".blob_transfer_profiles.json"),
+                                              max_buffered_bytes: int = 1024*1024*256):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=os.path.basename(local_file_path))
+        host = urlparse(blob_client.url).netloc
+
+        def load_profiles():
+            # A missing or unreadable profile file just means there's nothing to start from
+            try:
+                with open(file=profile_path, mode="r") as profile_file:
+                    return json.load(profile_file)
+            except (OSError, ValueError):
+                return {}
+
+        # Start from the settings that worked best for this host on a previous run, if there are any
+        profile = load_profiles().get(host, {"block_size": 1024*1024*4, "max_concurrency": 2})
+        block_size, max_concurrency = profile["block_size"], profile["max_concurrency"]
+        max_block_size, max_concurrency_limit = 1024*1024*100, 32 # 100 MiB, 32 workers
+
+        file_size = os.path.getsize(local_file_path)
+
+        # Small files are uploaded with a single put, so there's nothing to tune
+        if file_size <= block_size:
+            with open(file=local_file_path, mode="rb") as data:
+                blob_client.upload_blob(data=data, overwrite=True)
+            return
+
+        # A block blob can hold at most 50,000 blocks
+        block_size = max(block_size, -(-file_size // 50000))
+
+        # Every block being staged is held in memory, so concurrency times block size is kept within max_buffered_bytes,
+        # including for settings saved on a machine with more memory
+        max_concurrency = max(1, min(max_concurrency, max_buffered_bytes // block_size))
+
+        with open(file=local_file_path, mode="rb") as file_stream, \
+                ThreadPoolExecutor(max_workers=max_concurrency_limit) as executor:
+            block_id_list = []
+            best_throughput = 0.0
+            best_settings = (block_size, max_concurrency)
+
+            def stage_block(block_id: str, buffer: bytes):
+                blob_client.stage_block(block_id=block_id, data=buffer, length=len(buffer))
+
+            while True:
+                # While tuning, blocks are staged in rounds of max_concurrency so the throughput of each round can be measured
+                batch = []
+                for _ in range(max_concurrency):
+                    buffer = file_stream.read(block_size)
+                    if not buffer:
+                        break
+                    block_id = uuid.uuid4().hex
+                    block_id_list.append(BlobBlock(block_id=block_id))
+                    batch.append((block_id, buffer))
+
+                start = time.perf_counter()
+                list(executor.map(lambda block: stage_block(*block), batch))
+                throughput = sum(len(buffer) for _, buffer in batch) / max(time.perf_counter() - start, 1e-6)
+                if len(batch) < max_concurrency:
+                    break
+
+                # Scale up concurrency first, then block size, for as long as throughput keeps improving by 10%
+                # and the blocks of the next round still fit in max_buffered_bytes
+                if throughput > best_throughput * 1.1:
+                    best_throughput = throughput
+                    best_settings = (block_size, max_concurrency)
+                    if max_concurrency < max_concurrency_limit and max_concurrency * 2 * block_size <= max_buffered_bytes:
+                        max_concurrency = min(max_concurrency * 2, max_concurrency_limit)
+                    elif block_size < max_block_size and max_concurrency * block_size * 2 <= max_buffered_bytes:
+                        block_size = min(block_size * 2, max_block_size)
+                    else:
+                        break
+                else:
+                    # The last step didn't help, so go back to the best settings and keep them for the rest of the upload
+                    block_size, max_concurrency = best_settings
+                    break
+
+            # Once tuning is done, a new block is read as soon as any block finishes staging, so one slow block
+            # doesn't leave the other workers idle the way it does at the end of a round
+            in_flight = set()
+            while True:
+                buffer = file_stream.read(block_size)
+                if not buffer:
+                    break
+                block_id = uuid.uuid4().hex
+                block_id_list.append(BlobBlock(block_id=block_id))
+                in_flight.add(executor.submit(stage_block, block_id, buffer))
+
+                if len(in_flight) >= max_concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+
+            for future in wait(in_flight).done:
+                future.result()
+
+            blob_client.commit_block_list(block_id_list)
+
+        # Save the best settings for this host so the next upload starts from them
+        # The file is read again just before it's replaced, so settings saved for other hosts in the meantime are kept,
+        # and it's replaced in one step, so an upload running at the same time never reads a partly written file
+        profiles = load_profiles()
+        profiles[host] = {"block_size": best_settings[0], "max_concurrency": best_settings[1]}
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(profile_path)), suffix=".tmp")
+        try:
+            with open(fd, mode="w") as profile_file:
+                json.dump(profiles, profile_file)
+            os.replace(temp_path, profile_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    # </Snippet_upload_blob_transfer_options_autotune>
+
     # <Snippet_upload_blob_access_tier>
     def upload_blob_access_tier(self, blob_service_client: BlobServiceClient, container_name: str, blob_name: str):
         blob_client = blob_service_client.get_blob_client(container=container_name, blob=blob_name)
@@ -94,6 +586,33 @@ class BlobSamples(object):
             blob_client = blob_client.upload_blob(data=data, overwrite=True, validate_content=True)
     # </Snippet_upload_blob_transfer_validation>
 
+    # <Snippet_upload_blob_transfer_validation_md5>
+    def upload_blob_transfer_validation_md5(self, blob_service_client: BlobServiceClient, container_name: str, local_file_path: str,
+                                            block_size: int = 1024*1024*4):
+        blob_client = blob_service_client.get_blob_client(container=container_name, blob=os.path.basename(local_file_path))
+
+        with open(file=local_file_path, mode="rb") as file_stream:
+            block_id_list = []
+            file_md5 = hashlib.md5()
+
+            while True:
+                buffer = file_stream.read(block_size)
+                if not buffer:
+                    break
+
+                # The whole-file MD5 is updated from the same buffer that's staged, so the file is only read once
+                file_md5.update(buffer)
+
+                block_id = uuid.uuid4().hex
+                block_id_list.append(BlobBlock(block_id=block_id))
+
+                # validate_content sends a transactional MD5 of the block, which the service checks on receipt
+                blob_client.stage_block(block_id=block_id, data=buffer, length=len(buffer), validate_content=True)
+
+            # Store the whole-file MD5 on the blob when the block list is committed
+            blob_client.commit_block_list(block_id_list, content_settings=ContentSettings(content_md5=file_md5.digest()))
+    # </Snippet_upload_blob_transfer_validation_md5>
+
 if __name__ == '__main__':
     # TODO: Replace <storage-account-name> with your actual storage account name
     account_url = "https://<storage-account-name>.blob.core.windows.net"
@@ -108,11 +627,20 @@ if __name__ == '__main__':
     file_path = os.path.join(r'file_path', 'file_name')
     block_size = 1024*1024*4 # 4 MiB
     #sample.upload_blocks(container_client, file_path, block_size)
+    #sample.upload_blocks_concurrent(container_client, file_path, block_size, max_concurrency=8)
+    #sample.upload_blocks_mmap(container_client, file_path, block_size)
+    #sample.upload_blocks_resumable(container_client, file_path, block_size)
 
     #sample.upload_blob_data(blob_service_client, "sample-container")
+    #sample.upload_blob_data_packed(blob_service_client, "sample-container", "sample-packed-blob", (os.urandom(100) for _ in range(100000)))
     #sample.upload_blob_stream(blob_service_client, "sample-container")
+    #sample.upload_blob_stream_compressed(blob_service_client, "sample-container", "sample-blob.csv", io.BytesIO(b"a,b,c\n" * 100000))
     #sample.upload_blob_file(blob_service_client, "sample-container")
+    #sample.upload_blob_directory(account_url, "sample-container", os.path.join(r'dir_path'))
     #sample.upload_blob_tags(blob_service_client, "sample-container")
+    #sample.upload_blob_file_incremental(blob_service_client, "sample-container", file_path)
     #sample.upload_blob_transfer_options(account_url, "sample-container", "sample-blob.txt")
+    #sample.upload_blob_transfer_options_autotune(blob_service_client, "sample-container", file_path)
     #sample.upload_blob_access_tier(blob_service_client, "sample-container", "sample-blob.txt")
-    #sample.upload_blob_transfer_validation(blob_service_client, "sample-container", "sample-blob.txt")
\ No newline at end of file
+    #sample.upload_blob_transfer_validation(blob_service_client, "sample-container", "sample-blob.txt")
+    #sample.upload_blob_transfer_validation_md5(blob_service_client, "sample-container", file_path)
\ No newline at end of file
@@ -62,6 +62,65 @@ class BlobSamples(object):
             await blob_client.commit_block_list(block_id_list)
     # </Snippet_upload_blob_blocks>
 
+    # <Snippet_upload_blob_blocks_concurrent>
+    async def upload_blocks_concurrent(self, blob_container_client: ContainerClient, local_file_path: str, block_size: int,
+                                       max_concurrency: int = 8):
+        file_name = os.path.basename(local_file_path)
+        blob_client = blob_container_client.get_blob_client(file_name)
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+        failures = []
+
+        async def stage_block(block_id: str, buffer: bytes):
+            try:
+                await blob_client.stage_block(block_id=block_id, data=buffer, length=len(buffer))
+            except Exception as error:
+                # Record the failure before the slot is released, so the producer sees it as soon as it wakes
+                failures.append(error)
+            finally:
+                semaphore.release()
+
+        with open(file=local_file_path, mode="rb") as file_stream:
+            block_id_list = []
+            tasks = set()
+
+            try:
+                while True:
+                    # Wait for a free slot before reading, so at most max_concurrency blocks are held in memory
+                    await semaphore.acquire()
+                    if failures:
+                        break
+
+                    # Read from the file in the default executor so the event loop isn't blocked on disk I/O
+                    buffer = await loop.run_in_executor(None, file_stream.read, block_size)
+                    if not buffer:
+                        semaphore.release()
+                        break
+
+                    block_id = uuid.uuid4().hex
+                    block_id_list.append(BlobBlock(block_id=block_id))
+
+                    task = asyncio.create_task(stage_block(block_id, buffer))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                # Wait for the remaining blocks, stopping at the first failure
+                while tasks and not failures:
+                    await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                # Cancel the blocks that are still staging, so none of them outlive a failed upload
+                pending = list(tasks)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if failures:
+            raise failures[0]
+
+        await blob_client.commit_block_list(block_id_list)
+    # </Snippet_upload_blob_blocks_concurrent>
+
     # <Snippet_upload_blob_transfer_options>
     async def upload_blob_transfer_options(self, account_url: str, container_name: str, blob_name: str):
         # Create a BlobClient object with data transfer options for upload
@@ -69,7 +69,17 @@ class ListBlobs:
 
         def walk_blob_hierarchy(prefix=""):
             nonlocal depth
-            for item in container_client.walk_blobs(name_starts_with=prefix):
+            # Snapshots are returned in the same listing as their base blob, so one listing
+            # per level is enough to count the snapshots of every blob at that level
+            items = []
+            snapshot_counts = {}
+            for item in container_client.walk_blobs(name_starts_with=prefix, include=['snapshots']):
+                if isinstance(item, BlobPrefix) or not item.snapshot:
+                    items.append(item)
+                else:
+                    snapshot_counts[item.name] = snapshot_counts.get(item.name, 0) + 1
+
+            for item in items:
                 short_name = item.name[len(prefix):]
                 if isinstance(item, BlobPrefix):
                     print('Folder: ' + separator * depth + short_name)
@@ -78,8 +88,7 @@ class ListBlobs:
                     depth -= 1
                 else:
                     message = 'Blob: ' + separator * depth + short_name
-                    results = list(container_client.list_blobs(name_starts_with=item.name, include=['snapshots']))
-                    num_snapshots = len(results) - 1
+                    num_snapshots = snapshot_counts.get(item.name, 0)
                     if num_snapshots:
                         message += " ({} snapshots)".format(num_snapshots)
                     print(message)